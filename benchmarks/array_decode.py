@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+#
+# @file    array_decode.py
+# @brief   Decoding packets with large arrays into the same array
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 19:48
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+'''
+Decodes a stream of packets with an array of samples into the same
+packet and reports the time per packet and the number of array
+elements created per packet. Packets have the same number of samples,
+or a random number around it with --jitter.
+
+    $ python benchmarks/array_decode.py --samples 1024 --jitter 16
+'''
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from BitPacket import Array, Structure, UInt16, UInt32
+
+class Samples(object):
+
+    def __init__(self):
+        self.created = 0
+
+    def __call__(self, root):
+        self.created += 1
+        return UInt16("sample")
+
+def packet_bytes(sequence, samples):
+    return sequence.to_bytes(4, "big") + samples.to_bytes(2, "big") \
+        + b"\x00\x01" * samples
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.split("\n")[1])
+    parser.add_argument("--count", type = int, default = 2000,
+                        help = "number of packets to decode")
+    parser.add_argument("--samples", type = int, default = 1024,
+                        help = "number of samples per packet")
+    parser.add_argument("--jitter", type = int, default = 0,
+                        help = "maximum change of the number of samples")
+    args = parser.parse_args()
+
+    random.seed(0)
+    data = [packet_bytes(i, args.samples
+                         + random.randint(-args.jitter, args.jitter))
+            for i in range(args.count)]
+
+    samples = Samples()
+    packet = Structure("packet")
+    packet.append(UInt32("sequence"))
+    packet.append(Array("samples", UInt16("count"), samples))
+
+    start = time.perf_counter()
+    for d in data:
+        packet.set_bytes(d)
+    elapsed = time.perf_counter() - start
+
+    print("packets:  %d in %.2f s (%.1f us per packet)" \
+              % (args.count, elapsed, elapsed / args.count * 1000000))
+    print("elements: %.1f created per packet" \
+              % (float(samples.created) / args.count))
+
+if __name__ == "__main__":
+    main()
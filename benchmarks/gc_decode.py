@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+#
+# @file    gc_decode.py
+# @brief   Garbage collector pauses while decoding packets
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 15:02
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+'''
+Decodes lots of packets, one at a time, and reports the pauses of the
+cyclic garbage collector (number of collections, total and maximum
+pause per generation) and the number of objects it had to free. Packets
+without reference cycles are freed as soon as they are not used, so
+the collector has nothing to free.
+
+    $ python benchmarks/gc_decode.py --count 1000000
+'''
+
+import argparse
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from BitPacket import Array, BitField, BitStructure, Data, Structure, \
+    UInt8, UInt16, UInt32
+
+class Header(BitStructure):
+
+    def __init__(self):
+        BitStructure.__init__(self, "header")
+        self.append(BitField("version", 3))
+        self.append(BitField("type", 1))
+        self.append(BitField("flag", 1))
+        self.append(BitField("apid", 11))
+
+class Packet(Structure):
+
+    def __init__(self):
+        Structure.__init__(self, "packet")
+        self.append(Header())
+        self.append(UInt16("sequence"))
+        self.append(UInt32("time"))
+        self.append(Array("samples", UInt8("count"),
+                          lambda root: UInt16("sample")))
+        self.append(Data("payload", UInt8("length")))
+
+class Pauses(object):
+
+    def __init__(self):
+        self.start = None
+        self.count = [0, 0, 0]
+        self.total = [0.0, 0.0, 0.0]
+        self.maximum = [0.0, 0.0, 0.0]
+        self.collected = 0
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self.start = time.perf_counter()
+        elif self.start is not None:
+            pause = time.perf_counter() - self.start
+            generation = info["generation"]
+            self.count[generation] += 1
+            self.total[generation] += pause
+            self.maximum[generation] = max(self.maximum[generation], pause)
+            self.collected += info["collected"]
+            self.start = None
+
+def packet_bytes():
+    packet = Packet()
+    packet["header.version"] = 1
+    packet["header.apid"] = 42
+    packet["sequence"] = 7
+    packet["time"] = 123456
+    for i in range(4):
+        packet["samples.%d" % i] = i
+    packet["payload"] = b"0123456789"
+    return packet.bytes()
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.split("\n")[1])
+    parser.add_argument("--count", type = int, default = 1000000,
+                        help = "number of packets to decode")
+    args = parser.parse_args()
+
+    data = packet_bytes()
+
+    gc.collect()
+    pauses = Pauses()
+    gc.callbacks.append(pauses)
+
+    start = time.perf_counter()
+    for i in range(args.count):
+        packet = Packet()
+        packet.set_bytes(data)
+    elapsed = time.perf_counter() - start
+
+    gc.callbacks.remove(pauses)
+
+    print("packets:   %d in %.2f s" % (args.count, elapsed))
+    print("collected: %d objects" % pauses.collected)
+    for generation in range(3):
+        print("gen %d:     %6d collections, %8.2f ms total, %6.2f ms max" \
+                  % (generation, pauses.count[generation],
+                     pauses.total[generation] * 1000,
+                     pauses.maximum[generation] * 1000))
+
+if __name__ == "__main__":
+    main()
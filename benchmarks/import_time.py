@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+#
+# @file    import_time.py
+# @brief   Time needed to import BitPacket
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 19:22
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+'''
+Runs a few import statements in new processes with python -X importtime
+and reports the time spent importing modules (the best of all runs)
+and the number of imported modules, the slowest ones with --verbose.
+
+    $ python benchmarks/import_time.py --runs 10
+'''
+
+import argparse
+import os
+import subprocess
+import sys
+
+SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+STATEMENTS = [ "import BitPacket",
+               "from BitPacket import Structure, UInt8, UInt16",
+               "from BitPacket import Schema, SchemaCache",
+               "from BitPacket import *",
+               "from BitPacket import *; from BitPacket.writers import *" ]
+
+def import_times(statement):
+    # Each line of -X importtime is "import time: self | cumulative |
+    # name", with the name indented by its nesting level.
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = SOURCE
+    output = subprocess.run([sys.executable, "-X", "importtime",
+                             "-c", statement],
+                            env = environment, stderr = subprocess.PIPE,
+                            universal_newlines = True, check = True).stderr
+    modules = {}
+    total = 0
+    for line in output.splitlines()[1:]:
+        self, cumulative, name = line.split(":", 1)[1].split("|")
+        modules[name.strip()] = int(self)
+        if not name.startswith("  "):
+            total += int(cumulative)
+    return total, modules
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.split("\n")[1])
+    parser.add_argument("--runs", type = int, default = 10,
+                        help = "number of runs of each statement")
+    parser.add_argument("--verbose", action = "store_true",
+                        help = "show the slowest modules of each statement")
+    args = parser.parse_args()
+
+    for statement in STATEMENTS:
+        runs = [import_times(statement) for i in range(args.runs)]
+        total, modules = min(runs, key = lambda run: run[0])
+        print("%8.1f ms %4d modules  %s" \
+                  % (total / 1000.0, len(modules), statement))
+        if args.verbose:
+            slowest = sorted(modules.items(), key = lambda m: -m[1])[:5]
+            for name, time in slowest:
+                print("%20.1f ms  %s" % (time / 1000.0, name))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+#
+# @file    memory_fields.py
+# @brief   Memory used by decoded fields
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 15:41
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+'''
+Decodes an array of fields and reports the memory used per decoded
+field (the field itself, its attributes and its share of the array
+bookkeeping), measured with tracemalloc.
+
+    $ python benchmarks/memory_fields.py --count 100000
+'''
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from BitPacket import Array, BitField, BitStructure, UInt8, UInt32
+
+def bit_structure(root):
+    bits = BitStructure("bits")
+    bits.append(BitField("high", 4))
+    bits.append(BitField("low", 4))
+    return bits
+
+ELEMENTS = [("UInt8", lambda root: UInt8("value"), 1),
+            ("UInt32", lambda root: UInt32("value"), 4),
+            ("BitStructure (2 BitField)", bit_structure, 1)]
+
+def measure(fieldtype, size, count):
+    data = count.to_bytes(4, "big") + b"\x01" * (size * count)
+
+    tracemalloc.start()
+    array = Array("array", UInt32("count"), fieldtype)
+    array.set_bytes(data)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return used, array
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.split("\n")[1])
+    parser.add_argument("--count", type = int, default = 100000,
+                        help = "number of decoded fields")
+    args = parser.parse_args()
+
+    for name, fieldtype, size in ELEMENTS:
+        used, array = measure(fieldtype, size, args.count)
+        print("%-26s %8.1f bytes per field (%d fields, %.1f MB)" \
+                  % (name, float(used) / args.count, args.count,
+                     used / 1024.0 / 1024.0))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+#
+# @file    numeric_array.py
+# @brief   Decoding and encoding samples with Array and NumericArray
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 20:51
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+'''
+Decodes and encodes frames of little-endian samples held by an Array of
+UInt16LE fields and by a NumericArray, and reports the time per frame.
+Frames are decoded into a new packet each time and into the same
+packet.
+
+    $ python benchmarks/numeric_array.py --samples 4096
+'''
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from BitPacket import Array, NumericArray, Structure, UInt16, UInt16LE, \
+    UInt32
+
+def array_frame():
+    frame = Structure("frame")
+    frame.append(UInt32("time"))
+    frame.append(Array("samples", UInt16("count"),
+                       lambda root: UInt16LE("sample")))
+    return frame
+
+def numeric_array_frame():
+    frame = Structure("frame")
+    frame.append(UInt32("time"))
+    frame.append(NumericArray("samples", UInt16("count"), UInt16LE))
+    return frame
+
+FRAMES = [("Array", array_frame),
+          ("NumericArray", numeric_array_frame)]
+
+def frame_bytes(samples):
+    return (1234).to_bytes(4, "big") + samples.to_bytes(2, "big") \
+        + b"".join([(i % 4096).to_bytes(2, "little") for i in range(samples)])
+
+def measure(function, count):
+    start = time.perf_counter()
+    for i in range(count):
+        function()
+    return (time.perf_counter() - start) / count * 1000000
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.split("\n")[1])
+    parser.add_argument("--count", type = int, default = 200,
+                        help = "number of frames")
+    parser.add_argument("--samples", type = int, default = 4096,
+                        help = "number of samples per frame")
+    args = parser.parse_args()
+
+    data = frame_bytes(args.samples)
+    for name, frame in FRAMES:
+        packet = frame()
+        new = measure(lambda: frame().set_bytes(data), args.count)
+        same = measure(lambda: packet.set_bytes(data), args.count)
+        encode = measure(packet.bytes, args.count)
+        assert packet.bytes() == data
+        print("%-12s decode %9.1f us (new) %9.1f us (same), "
+              "encode %9.1f us" % (name, new, same, encode))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+#
+# @file    schema_startup.py
+# @brief   Startup time of compiled schemas with and without cache
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 18:31
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+'''
+Creates the compiled schemas of lots of packet definitions, in a new
+process each time, and reports the time needed until all of them are
+ready: without cache, with an empty cache directory (cold) and with the
+schemas already saved (warm).
+
+    $ python benchmarks/schema_startup.py --count 300
+'''
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from BitPacket import Array, BitField, BitStructure, Data, Schema, \
+    SchemaCache, String, Structure, UInt8, UInt16, UInt32
+
+def definition(number):
+    # Each definition has a different number of fields, so they all
+    # have different fingerprints.
+    def packet():
+        packet = Structure("packet%d" % number)
+        header = BitStructure("header")
+        header.append(BitField("version", 3))
+        header.append(BitField("type", 1))
+        header.append(BitField("flag", 1))
+        header.append(BitField("apid", 11))
+        packet.append(header)
+        packet.append(UInt16("sequence"))
+        packet.append(UInt32("time"))
+        for i in range(number % 20):
+            packet.append(UInt16("parameter%d" % i))
+        for i in range(number // 20):
+            packet.append(String("name%d" % i, 8))
+        packet.append(Array("samples", UInt8("count"),
+                            lambda root: UInt16("sample")))
+        packet.append(Data("payload", UInt8("length")))
+        return packet
+    return packet
+
+def startup(mode, count, directory):
+    start = time.perf_counter()
+    if mode == "none":
+        schemas = [Schema(definition(i)(), compiled = True)
+                   for i in range(count)]
+    else:
+        cache = SchemaCache(directory)
+        schemas = [cache.schema(definition(i), "packet%d" % i)
+                   for i in range(count)]
+    return time.perf_counter() - start
+
+def run(mode, count, directory):
+    start = time.perf_counter()
+    output = subprocess.check_output([sys.executable, __file__,
+                                      "--count", str(count),
+                                      "--directory", directory,
+                                      "--mode", mode])
+    return float(output), time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.split("\n")[1])
+    parser.add_argument("--count", type = int, default = 300,
+                        help = "number of packet definitions")
+    parser.add_argument("--directory", help = "cache directory")
+    parser.add_argument("--mode", choices = ["none", "cold", "warm"],
+                        help = "run a single startup and print its time")
+    args = parser.parse_args()
+
+    if args.mode is not None:
+        print(startup(args.mode, args.count, args.directory))
+        return
+
+    directory = tempfile.mkdtemp()
+    try:
+        for mode in ("none", "cold", "warm"):
+            schemas, process = run(mode, args.count, directory)
+            print("%-5s %8.1f ms schemas, %8.1f ms process (%d schemas)" \
+                      % (mode, schemas * 1000, process * 1000, args.count))
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    main()
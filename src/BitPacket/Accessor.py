@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+#
+# @file    Accessor.py
+# @brief   Pre-resolved access to fields inside containers
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 14:05
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+__doc__ = '''
+
+    Accessors
+    =========
+
+    Pre-resolved access to fields inside containers.
+
+    **API reference**: :class:`Accessor`
+
+    Accessing a field by its key (e.g. packet["header.time.coarse"])
+    needs to split the key and look up each name every time. An
+    :mod:`Accessor` is obtained with :func:`Container.accessor` and
+    keeps the position of each field in the key, so it can be used to
+    access the same field in any container with the same fields (e.g.
+    all the packets of a given type or all the elements of an
+    :mod:`Array`):
+
+    >>> packet = Structure("packet")
+    >>> header = Structure("header")
+    >>> header.append(UInt8("id"))
+    >>> header.append(UInt16("length"))
+    >>> packet.append(header)
+
+    >>> length = packet.accessor("header.length")
+    >>> length.set_value(packet, 5)
+    >>> length.value(packet)
+    5
+
+    If the fields of a container are not the ones found when the
+    accessor was created, the field is looked up by its key as usual.
+
+'''
+
+class Accessor(object):
+    '''
+    An :mod:`Accessor` gives direct access to the field identified by a
+    key in containers with the same fields.
+    '''
+
+    def __init__(self, key, indexes, names):
+        '''
+        Initialize the accessor for the field identified by *key*.
+        *indexes* is the list with the index of each field in the key
+        inside its container and *names* is the list with the name of
+        each of these fields. Use :func:`Container.accessor` to create
+        accessors.
+        '''
+        self.__key = key
+        self.__path = tuple(zip(indexes, names))
+
+    def key(self):
+        '''
+        Returns the key of the field accessed by this accessor.
+        '''
+        return self.__key
+
+    def field(self, container):
+        '''
+        Returns the field of the given *container* identified by this
+        accessor's key. If the field does not exist a *KeyError*
+        exception is raised.
+        '''
+        field = container
+        try:
+            for index, name in self.__path:
+                field = field._child_at(index)
+                # Fields found in other positions are looked up by key.
+                if field.name() != name:
+                    return container.field(self.__key)
+        except (AttributeError, IndexError):
+            return container.field(self.__key)
+        return field
+
+    def value(self, container):
+        '''
+        Returns the value of the field of the given *container*
+        identified by this accessor's key.
+        '''
+        return self.field(container).value()
+
+    def set_value(self, container, value):
+        '''
+        Sets the given *value* to the field of the given *container*
+        identified by this accessor's key.
+        '''
+        self.field(container).set_value(value)
@@ -207,11 +207,33 @@ __doc__ = '''
     contains two *AddressList* fields. The first one with a single
     address and the second with two.
 
+    Arrays of numeric values (e.g. samples of a signal) are much faster
+    with a :mod:`NumericArray`, which does not create a field for each
+    element.
+
 '''
 
+from BitPacket.utils.compatibility import intern
+from BitPacket.utils.stream import read_stream
+
 from BitPacket.Container import FIELD_SEPARATOR
+from BitPacket.Field import Field, _custom_codec
 from BitPacket.Structure import Structure
 from BitPacket.MetaField import MetaField
+from BitPacket.Schema import ArrayNode
+
+# Names of the array elements (i.e. their indexes), shared by all the
+# arrays.
+__ARRAY_NAMES__ = []
+
+def _element_name(index):
+    '''
+    Returns the (interned) name of the array element at *index*.
+    '''
+    names = __ARRAY_NAMES__
+    while len(names) <= index:
+        names.append(intern(str(len(names))))
+    return names[index]
 
 class Array(Structure):
 
@@ -222,6 +244,8 @@ class Array(Structure):
     same type) are stored.
     '''
 
+    __slots__ = ("__length", "__fieldtype", "__shape")
+
     def __init__(self, name, lengthfield, fieldtype):
         '''
         Initialize the array with the given *name*, a *lengthfield* for the
@@ -234,23 +258,109 @@ class Array(Structure):
 
         self.__length = lengthfield
         self.__fieldtype = fieldtype
+        # Shape of all the elements (see Field._shape()), or None if
+        # they do not have the same one.
+        self.__shape = None
 
         Structure.append(self, self.__length)
 
     def _decode(self, stream):
-        # Clear all fields in the array.
+        # The length field is missing if the array has been reset.
+        elements = self.fields()
+        if not elements or elements[0] is not self.__length:
+            self.reset()
+            Structure.append(self, self.__length)
+
+        self.__length._decode(stream)
+        length = self.__length.value()
+
+        # The elements already in the array are reused if the factory
+        # still creates elements with their shape (it might depend on
+        # other fields) and only the missing ones are created.
+        elements = self.fields()
+        count = len(elements) - 1
+        root = self.root()
+        if count > 0 and length > 0 \
+                and self.__fieldtype(root)._shape() != self.__shape:
+            self._truncate(1)
+            count = 0
+        for i in range(1, min(count, length) + 1):
+            elements[i]._decode(stream)
+
+        if length > count:
+            new_fields = []
+            for i in range(count, length):
+                new_field = self.__fieldtype(root)
+                new_field._set_name(_element_name(i))
+                new_field._decode(stream)
+                new_fields.append(new_field)
+            self._extend(new_fields)
+            self.__elements_added(new_fields, count == 0)
+        elif length < count:
+            self._truncate(length + 1)
+
+    def _decode_resumable(self, stream):
         self.reset()
 
-        # Re-add length field and decode its value.
         Structure.append(self, self.__length)
-        self.__length._decode(stream)
+        for missing in self.__length._decode_resumable(stream):
+            yield missing
 
-        # Append fields and parse them.
+        # Already decoded elements are kept when resumed.
         for i in range(self.__length.value()):
             new_field = self.__fieldtype(self.root())
-            new_field._set_name("%d" % i)
-            new_field._decode(stream)
+            new_field._set_name(_element_name(i))
+            for missing in new_field._decode_resumable(stream):
+                yield missing
             Structure.append(self, new_field)
+            self.__elements_added([new_field], i == 0)
+
+    def __elements_added(self, fields, first):
+        '''
+        Updates the shape of the elements after the given *fields* have
+        been appended. *first* is True if they are the first elements.
+        '''
+        shape = fields[0]._shape() if first else self.__shape
+        for f in fields:
+            if shape is None:
+                break
+            if f._shape() != shape:
+                shape = None
+        self.__shape = shape
+
+    def _decode_lazy(self, stream):
+        # The number of elements is only known after decoding.
+        self._decode(stream)
+
+    def _skip(self, stream):
+        self.__length._decode(stream)
+        length = self.__length.value()
+        root = self.root()
+        element = self.__fieldtype(root)
+        size = element._static_size()
+        if size is not None:
+            read_stream(stream, length * size)
+            return
+        for i in range(length):
+            if i > 0:
+                element = self.__fieldtype(root)
+            element._skip(stream)
+
+    def _schema(self):
+        if _custom_codec(self, Array):
+            return Field._schema(self)
+        # All the elements are expected to have the same schema.
+        element = self.__fieldtype(self.root())
+        return ArrayNode(self.name(), self.__length._schema(),
+                         element._schema())
+
+    def _static_size(self):
+        return None
+
+    def _shape(self):
+        # The elements are not part of the shape, as their number
+        # depends on the decoded data.
+        return (type(self), self.__length._shape())
 
     def append(self, field):
         '''
@@ -271,9 +381,10 @@ class Array(Structure):
 
         if isinstance(field, basefieldtype):
             value = self.__length.value()
-            field._set_name(str(value))
+            field._set_name(_element_name(value))
             self.__length.set_value(value + 1)
             Structure.append(self, field)
+            self.__elements_added([field], value == 0)
         else:
             raise TypeError("Invalid field type for array '%s' "
                             "(expected %s, got %s)" \
@@ -298,9 +409,10 @@ class Array(Structure):
             pass
         elif int(names[0]) == length:
             new_field = self.__fieldtype(self.root())
-            new_field._set_name("%d" % length)
+            new_field._set_name(_element_name(length))
             Structure.append(self, new_field)
             self.__length.set_value (length + 1)
+            self.__elements_added([new_field], length == 0)
         else: # int(names[0]) > length
             raise IndexError("Index %s must be <= %s" % (names[0], length))
 
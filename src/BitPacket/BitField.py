@@ -54,14 +54,14 @@ __doc__ = '''
 
 '''
 
-from BitPacket.utils.binary import byte_end, bin_to_int, int_to_bin
+from BitPacket.utils.binary import bit_mask, byte_end, bytes_to_int, \
+    int_to_bytes
 from BitPacket.utils.bitstream import BitStreamReader, BitStreamWriter
-from BitPacket.utils.stream import read_stream, write_stream
+from BitPacket.utils.stream import check_buffer
 from BitPacket.utils.string import hex_string
 
-from BitPacket.Field import Field
-
-from math import log
+from BitPacket.Field import Field, _custom_codec
+from BitPacket.Schema import BitFieldNode
 
 class BitField(Field):
     '''
@@ -72,6 +72,8 @@ class BitField(Field):
     used inside a :class:`BitStructure`.
     '''
 
+    __slots__ = ("__value", "__size")
+
     def __init__(self, name, size, value = 0):
         '''
         Initialize the field with the given *name* and *size* (in
@@ -79,45 +81,81 @@ class BitField(Field):
         to *value* if specified.
         '''
         Field.__init__(self, name)
-        self.__bits = []
+        self.__value = 0
         self.__size = size
         self.set_value(value)
 
     def _encode(self, stream):
         if isinstance(stream, BitStreamWriter):
-            write_stream(stream, self.size(), self.__bits)
+            stream.write(self.__value, self.size())
         else:
             raise TypeError("Stream for bit fields should be bit oriented "
                             "(hint: enclose it in a BitStructure)")
 
     def _decode(self, stream):
         if isinstance(stream, BitStreamReader):
-            self.__bits = read_stream(stream, self.size())
+            self.__value = stream.read(self.size())
         else:
             raise TypeError("Stream for bit fields should be bit oriented "
                             "(hint: enclose it in a BitStructure)")
 
+    def _schema(self):
+        if _custom_codec(self, BitField, ("_encode", "_decode", "value",
+                                          "set_value")):
+            return Field._schema(self)
+        return BitFieldNode(self.name(), self.__size)
+
+    def _shape(self):
+        return (type(self), self.__size)
+
+    def _peek(self, view, offset, layout):
+        # Only plain bit fields can be decoded without the field.
+        if _custom_codec(self, BitField, ("_decode", "value")):
+            return Field._peek(self, view, offset, layout)
+        check_buffer(view, offset, layout.size)
+        bits = bytes_to_int(view[offset:offset + layout.size])
+        shift = layout.size * 8 - layout.bit_offset - layout.bit_size
+        return (bits >> shift) & bit_mask(layout.bit_size)
+
+    def _patch(self, view, offset, layout, value):
+        # Only plain bit fields can be encoded without the field.
+        if _custom_codec(self, BitField, ("_encode", "set_value")):
+            return Field._patch(self, view, offset, layout, value)
+        value = self.__check_value(value)
+        check_buffer(view, offset, layout.size)
+        end = offset + layout.size
+        shift = layout.size * 8 - layout.bit_offset - layout.bit_size
+        mask = bit_mask(layout.bit_size) << shift
+        bits = bytes_to_int(view[offset:end])
+        bits = (bits & ~mask) | (value << shift)
+        view[offset:end] = int_to_bytes(bits, layout.size)
+
     def value(self):
         '''
         Returns the value of this field. As single bit fields do not
         have a concrete type (signed integers, float...) this will
         return the unsigned integer representation of this field.
         '''
-        return bin_to_int(self.__bits)
+        return self.__value
 
     def set_value(self, value):
         '''
         Sets a new unsigned integer *value* to the field.
         '''
+        self.__value = self.__check_value(value)
+
+    def __check_value(self, value):
+        '''
+        Returns the given *value* as an integer if it fits in the field,
+        otherwise a *ValueError* exception is raised.
+        '''
         if value < 0:
             raise ValueError("Negative values not allowed in BitFields "
                              "(field: '%s')" % self.name())
 
-        size = self.size()
-        if value > 0:
-            size = int(log(value, 2) + 1)
+        size = value.bit_length()
         if size <= self.size():
-            self.__bits = int_to_bin(value, self.size())
+            return int(value)
         else:
             raise ValueError("Value is bigger than the field size "
                              "(value %d has bit size %d, '%s' bit size is %d)"
@@ -138,7 +138,9 @@ __doc__ = '''
 from BitPacket.utils.binary import byte_end
 from BitPacket.utils.bitstream import BitStreamReader, BitStreamWriter
 
-from BitPacket.Container import Container
+from BitPacket.Container import Container, FIELD_SEPARATOR
+from BitPacket.Field import Field, FieldLayout, _custom_codec
+from BitPacket.Schema import BitStructureNode
 
 class BitStructure(Container):
     '''
@@ -147,6 +149,8 @@ class BitStructure(Container):
     other BitPacket types.
     '''
 
+    __slots__ = ()
+
     def __init__(self, name):
         '''
         Initialize the bit structure field with the given *name*. By
@@ -161,10 +165,30 @@ class BitStructure(Container):
         bitstream.flush()
 
     def _decode(self, stream):
-        bitstream = BitStreamReader(stream)
+        # All the bytes of the structure are read at once.
+        bitstream = BitStreamReader(stream, self.size())
         for f in self.fields():
             f._decode(bitstream)
 
+    def _schema(self):
+        if _custom_codec(self, BitStructure):
+            return Field._schema(self)
+        return BitStructureNode(self.name(),
+                                [f._schema() for f in self.fields()],
+                                self.size())
+
+    def _static_size(self):
+        return self.size()
+
+    def _layout(self, key, offset, layouts):
+        size = self.size()
+        bit_offset = 0
+        for f in self.fields():
+            layouts.append(FieldLayout(key + FIELD_SEPARATOR + f.name(),
+                                       offset, size, bit_offset, f.size()))
+            bit_offset += f.size()
+        return offset + size
+
     def size(self):
         '''
         Returns the size of the field in bytes. This function will add
@@ -64,6 +64,8 @@ class Boolean(BitField):
     represent True and False values.
     '''
 
+    __slots__ = ()
+
     def __init__(self, name, value = False):
         '''
         Initialize the field with the given *name*. The default value is
@@ -50,11 +50,64 @@ __doc__ = '''
     adding fields. That is, it provides the base methods to build
     Containers.
 
+
+    Field layouts
+    -------------
+
+    If all the fields of a container have a fixed size (i.e. there are
+    no arrays or strings whose length is given by another field), the
+    position of each field inside the container is always the
+    same. :func:`Container.layout` returns the byte offset and size of
+    each field (and the bit offset and size of bit fields inside a
+    :mod:`BitStructure`):
+
+    >>> ip = Structure("IP")
+    >>> ip.append(UInt8("tos"))
+    >>> ip.append(UInt16("length"))
+    >>> ip.layout()
+    [FieldLayout(key='tos', offset=0, size=1, bit_offset=None, bit_size=None), FieldLayout(key='length', offset=1, size=2, bit_offset=None, bit_size=None)]
+
+    With the layout, a single field can be decoded directly from a
+    buffer without decoding the whole container:
+
+    >>> ip.peek(b"\\x03\\x00\\x92", "length")
+    146
+
+    In the same way, a single field can be changed directly in an
+    already encoded buffer:
+
+    >>> data = bytearray(b"\\x03\\x00\\x92")
+    >>> ip.patch(data, "length", 147)
+    >>> data
+    bytearray(b'\\x03\\x00\\x93')
+
 '''
 
-from BitPacket.Field import Field
+from BitPacket.utils.stream import buffer_view
+
+from BitPacket.Accessor import Accessor
+from BitPacket.Field import Field, FIELD_SEPARATOR
+from BitPacket.Schema import StructureNode
 
-FIELD_SEPARATOR = "."
+def _index_fields(container, prefix, index, keys):
+    '''
+    Adds all the fields of *container* (recursively) to the *index*
+    dictionary, with their keys prefixed by *prefix*, and appends the
+    keys of the non-container fields to the *keys* list. Returns False
+    if any container is being lazily decoded, as its fields might
+    still change, True otherwise.
+    '''
+    if container._lazy():
+        return False
+    for f in container.fields():
+        key = prefix + f.name()
+        index[key] = f
+        if isinstance(f, Container):
+            if not _index_fields(f, key + FIELD_SEPARATOR, index, keys):
+                return False
+        else:
+            keys.append(key)
+    return True
 
 class Container(Field):
     '''
@@ -63,6 +116,9 @@ class Container(Field):
     containers as well), thus forming a bigger field.
     '''
 
+    __slots__ = ("__fields", "__fields_name", "__layout", "__size",
+                 "__index", "__keys")
+
     def __init__(self, name):
         '''
         Initialize the :mod:`Container` with the given *name*. By
@@ -71,6 +127,10 @@ class Container(Field):
         Field.__init__(self, name)
         self.__fields = []
         self.__fields_name = {}
+        self.__layout = None
+        self.__size = None
+        self.__index = None
+        self.__keys = None
 
     def append(self, field):
         '''
@@ -87,7 +147,172 @@ class Container(Field):
 
         self.__fields.append(field)
         field._set_parent(self)
-        field._set_root(self.root())
+        self._fields_changed(field)
+
+    def _extend(self, fields):
+        '''
+        Appends all the given *fields* at once. Unlike *append()*, field
+        names are not checked, so the caller must make sure they are
+        not in the container yet.
+        '''
+        for f in fields:
+            self.__fields_name[f.name()] = f
+            f._set_parent(self)
+        self.__fields.extend(fields)
+        self._fields_changed()
+
+    def _truncate(self, count):
+        '''
+        Removes all the fields after the first *count* fields.
+        '''
+        for f in self.__fields[count:]:
+            del self.__fields_name[f.name()]
+            f._set_parent(None)
+        del self.__fields[count:]
+        self._fields_changed()
+
+    def layout(self):
+        '''
+        Returns a list of :class:`FieldLayout` with the position of all
+        the fields of this container, in the same order as
+        *keys()*. Each layout contains the field key, its byte offset
+        and size and, for bit fields, the bit offset and size inside its
+        :mod:`BitStructure`. The layout is computed once and it is only
+        computed again if the fields of the container change. A
+        *ValueError* exception is raised if the container does not have
+        a fixed layout (e.g. it contains an :mod:`Array`).
+        '''
+        return [layout for layout, field in self.__layout_index().values()]
+
+    def peek(self, buffer, name, offset = 0):
+        '''
+        Returns the value of the field identified by *name* decoded
+        directly from the given *buffer* (any object supporting the
+        buffer protocol) containing this container at
+        *offset*. Neither the container nor the field are modified,
+        only the bytes of the requested field are decoded. This only
+        works for containers with a fixed layout (see *layout()*). A
+        *TypeError* exception is raised if the field has its own way of
+        decoding its value (e.g. a subclass overriding *value()*).
+        '''
+        try:
+            layout, field = self.__layout_index()[name]
+        except KeyError:
+            raise KeyError("Field '%s' does not exist in '%s'" \
+                               % (name, self.name()))
+        return field._peek(buffer_view(buffer), offset + layout.offset,
+                           layout)
+
+    def patch(self, buffer, name, value, offset = 0):
+        '''
+        Sets the given *value* to the field identified by *name*
+        directly into the given writable *buffer* (bytearray,
+        memoryview, mmap...) containing this container, already
+        encoded, at *offset*. Only the bytes of the field are written
+        (for bit fields, only its bits), the rest of the buffer and the
+        container are not modified. This only works for containers with
+        a fixed layout (see *layout()*). A *TypeError* exception is
+        raised if the field has its own way of encoding its value
+        (e.g. a subclass overriding *set_value()*).
+        '''
+        try:
+            layout, field = self.__layout_index()[name]
+        except KeyError:
+            raise KeyError("Field '%s' does not exist in '%s'" \
+                               % (name, self.name()))
+        field._patch(buffer_view(buffer), offset + layout.offset, layout,
+                     value)
+
+    def __layout_index(self):
+        '''
+        Returns an (ordered) dictionary with the layout of all the
+        fields and the fields themselves, identified by their keys.
+        '''
+        if self.__layout is None:
+            layouts = []
+            offset = 0
+            for f in self.fields():
+                offset = f._layout(f.name(), offset, layouts)
+            index = {}
+            for layout in layouts:
+                index[layout.key] = (layout, self.field(layout.key))
+            self.__layout = index
+        return self.__layout
+
+    def _schema(self):
+        return StructureNode(self.name(),
+                             [f._schema() for f in self.fields()])
+
+    def _shape(self):
+        return (type(self), tuple([(f.name(), f._shape())
+                                   for f in Container.fields(self)]))
+
+    def _layout(self, key, offset, layouts):
+        if self._static_size() is None:
+            raise ValueError("Field '%s' does not have a fixed size" % key)
+        for f in self.fields():
+            offset = f._layout(key + FIELD_SEPARATOR + f.name(), offset,
+                               layouts)
+        return offset
+
+    def _fields_changed(self, field = None, prefix = ""):
+        '''
+        Called when the fields of this container, or the fields of any
+        container inside it, change. Information computed from the
+        fields (e.g. the layout or the size) is discarded. If the only
+        change is that *field* has been appended to the container with
+        the given key *prefix* (relative to this container), the field
+        is just added to the keys index.
+        '''
+        self.__layout = None
+        self.__size = None
+        self.__keys = None
+        if self.__index and field is not None:
+            key = prefix + field.name()
+            self.__index[key] = field
+            if isinstance(field, Container) and \
+                    not _index_fields(field, key + FIELD_SEPARATOR,
+                                      self.__index, []):
+                self.__index = None
+        else:
+            self.__index = None
+        parent = self.parent()
+        if parent is not None:
+            parent._fields_changed(field,
+                                   self.name() + FIELD_SEPARATOR + prefix)
+
+    def __key_index(self):
+        '''
+        Returns a dictionary with all the fields (recursively)
+        identified by their keys, or None if the fields are being
+        lazily decoded. The dictionary is only built again if the
+        fields of the container change.
+        '''
+        if self.__index is None:
+            index = {}
+            keys = []
+            if _index_fields(self, "", index, keys):
+                self.__index = index
+                self.__keys = keys
+            else:
+                self.__index = False
+        return self.__index or None
+
+    def _lazy(self):
+        '''
+        Returns True if the container has been lazily decoded and some
+        of its fields are still pending to be decoded.
+        '''
+        return False
+
+    def _size_notified(self):
+        # The size is only cached if all the fields notify their size
+        # changes. Containers call it right after size().
+        return self.__size is not None and Field._size_notified(self)
+
+    def _size_changed(self):
+        self.__size = None
+        Field._size_changed(self)
 
     def field(self, name):
         '''
@@ -96,9 +321,13 @@ class Container(Field):
         separators are allowed). If the field does not exist a
         *KeyError* exception is raised.
         '''
+        index = self.__key_index()
+        if index is not None and name in index:
+            return index[name]
+
         names = name.split(FIELD_SEPARATOR, 1)
         try:
-            field = self.__fields_name[names[0]]
+            field = self._child(names[0])
             if len(names) >= 2:
                 if isinstance(field, Container):
                     field = field.field(names[1])
@@ -112,6 +341,41 @@ class Container(Field):
                                % (name, self.name(), err))
         return field
 
+    def accessor(self, name):
+        '''
+        Returns an :class:`Accessor` for the field identified by *name*
+        (see *field()*). The accessor can be used to access the same
+        field in this or any other container with the same fields
+        without looking up the field by its name. If the field does not
+        exist a *KeyError* exception is raised.
+        '''
+        # Raise the usual exception if the field does not exist.
+        self.field(name)
+
+        names = name.split(FIELD_SEPARATOR)
+        indexes = []
+        field = self
+        for n in names:
+            child = field._child(n)
+            indexes.append(field.fields().index(child))
+            field = child
+        return Accessor(name, indexes, names)
+
+    def _child_at(self, index):
+        '''
+        Returns the direct child field at the given *index*. An
+        *IndexError* exception is raised if the index is out of range.
+        '''
+        return self.__fields[index]
+
+    def _child(self, name):
+        '''
+        Returns the direct child field identified by *name* (without
+        any dot separator). A *KeyError* exception is raised if the
+        field does not exist.
+        '''
+        return self.__fields_name[name]
+
     def fields(self):
         '''
         Returns the (ordered) list of fields of this :mod:`Container`.
@@ -126,6 +390,12 @@ class Container(Field):
         an example, "a.b.c" is the key for a field *c* inside a *b*
         container which is also inside a root *a* container.
         '''
+        # The index is built again if only the keys were discarded.
+        if self.__keys is None:
+            self.__index = None
+        if self.__key_index() is not None:
+            return list(self.__keys)
+
         keys = []
         for field in self.fields():
             name = field.name()
@@ -139,12 +409,22 @@ class Container(Field):
     def size(self):
         '''
         Returns the size of the field in bytes. That is, the sum of all
-        byte sizes of the fields in this :mod:`Container`.
+        byte sizes of the fields in this :mod:`Container`. The size is
+        only computed again if the size of any of the fields changes,
+        unless any field has its own *size()* method, which is then
+        always called.
         '''
-        size = 0
-        for f in self.fields():
-            size += f.size()
-        return size
+        if self.__size is None:
+            size = 0
+            cached = True
+            for f in self.fields():
+                size += f.size()
+                if cached and not f._size_notified():
+                    cached = False
+            if not cached:
+                return size
+            self.__size = size
+        return self.__size
 
     def reset(self):
         '''
@@ -152,6 +432,7 @@ class Container(Field):
         '''
         self.__fields = []
         self.__fields_name = {}
+        self._fields_changed()
 
     def __len__(self):
         '''
@@ -165,9 +446,13 @@ class Container(Field):
         same as calling container.field(name).value(). If the field does
         not exists a *KeyError* exception is raised.
         '''
+        index = self.__key_index()
+        if index is not None and name in index:
+            return index[name].value()
+
         names = name.split(FIELD_SEPARATOR, 1)
         try:
-            field = self.__fields_name[names[0]]
+            field = self._child(names[0])
             if len(names) < 2:
                 return field.value()
             else:
@@ -183,13 +468,18 @@ class Container(Field):
         container.field(name).set_value(value). If the field does not
         exists a *KeyError* exception is raised.
         '''
+        index = self.__key_index()
+        if index is not None and name in index:
+            index[name].set_value(value)
+            return
+
         names = name.split(FIELD_SEPARATOR, 1)
         try:
-            field = self.__fields_name[names[0]]
+            field = self._child(names[0])
             if len(names) < 2:
                 field.set_value(value)
             else:
                 field[names[1]] = value
         except KeyError:
             raise KeyError("Field '%s' does not exist in '%s'" \
-                               % (name, slef.name()))
+                               % (name, self.name()))
@@ -108,8 +108,11 @@ __doc__ = '''
 '''
 
 from BitPacket.utils.callable import param_call
+from BitPacket.utils.stream import read_stream
 
 from BitPacket.Container import FIELD_SEPARATOR
+from BitPacket.Field import Field, _custom_codec
+from BitPacket.Schema import DataNode
 from BitPacket.Structure import Structure
 from BitPacket.String import String
 
@@ -123,6 +126,8 @@ class Data(Structure):
     is internally a :class:`String`.
     '''
 
+    __slots__ = ("__length", "__data", "__wordsize")
+
     def __init__(self, name, lengthfield, wordsize = 1):
         '''
         Initialize the field with the given *name* and a
@@ -148,6 +153,26 @@ class Data(Structure):
         Structure.append(self, self.__length)
         Structure.append(self, self.__data)
 
+    def _decode_lazy(self, stream):
+        # The data length is obtained directly from the length field,
+        # so both fields are decoded at once.
+        self._decode(stream)
+
+    def _skip(self, stream):
+        self.__length._decode(stream)
+        read_stream(stream, self.__length.value()
+                    * param_call(self.__wordsize, self.root()))
+
+    def _schema(self):
+        if _custom_codec(self, Data, ("_encode", "_decode", "value",
+                                      "set_value")):
+            return Field._schema(self)
+        if callable(self.__wordsize):
+            raise TypeError("Field '%s' does not have a fixed word size" \
+                                % self.name())
+        return DataNode(self.name(), self.__length._schema(),
+                        self.__wordsize)
+
     def value(self):
         '''
         Returns the value of the *Data* field as a string.
@@ -166,7 +191,7 @@ class Data(Structure):
         wordsize = param_call(self.__wordsize, self.root())
         if (length % wordsize) == 0:
             try:
-                self.__length.set_value(length / wordsize)
+                self.__length.set_value(length // wordsize)
             except:
                 raise ValueError("Data length must be lower than length "
                                  "field maximum size (%d given)" % length)
@@ -74,7 +74,9 @@ __doc__ = '''
 
     This method must return the field's size. Note that some fields
     are bit-oriented, so the method might return values for different
-    units (basically, bits and bytes)::
+    units (basically, bits and bytes). Containers only cache their size
+    if all their fields are BitPacket fields, so the size of a field
+    with its own *size()* method can change at any time::
 
         def str_value():_
 
@@ -131,9 +133,43 @@ __doc__ = '''
 
 '''
 
+import weakref
+
+from collections import namedtuple
 from io import BytesIO, StringIO
 
-from BitPacket.writers.WriterTextBasic import WriterTextBasic
+from BitPacket.utils.stream import BufferReader, BufferWriter, \
+    IncompleteDataError, buffer_view, read_stream
+
+# Position of a field inside a fixed layout container. *offset* and
+# *size* are given in bytes. For bit fields, *offset* and *size* are the
+# ones of the enclosing bit structure and *bit_offset* and *bit_size*
+# give the position of the field inside it (starting at the most
+# significant bit). For other fields *bit_offset* and *bit_size* are
+# None.
+FieldLayout = namedtuple("FieldLayout", "key offset size bit_offset bit_size")
+
+# Separator of the field names in keys (e.g. "header.length").
+FIELD_SEPARATOR = "."
+
+def _identity(value):
+    '''
+    The default calibration curve, shared by all fields. It returns the
+    given *value* unchanged.
+    '''
+    return value
+
+def _custom_codec(field, base, names = ("_encode", "_decode")):
+    '''
+    Returns True if the type of the given *field* overrides any of the
+    methods *names* of the class *base*, so the field is encoded or
+    decoded in its own way.
+    '''
+    field_type = type(field)
+    for name in names:
+        if getattr(field_type, name) is not getattr(base, name):
+            return True
+    return False
 
 class Field(object):
     '''
@@ -144,19 +180,21 @@ class Field(object):
     the field should be built, and other field related details.
     '''
 
+    __slots__ = ("__name", "__parent", "__calibration", "__weakref__")
+
     def __init__(self, name):
         '''
         Initialize the field with the given *name*. And identity
         (returning the field's value) calibration curve is set by
         default.
         '''
+        # The parent is a weak reference (None if the field is not
+        # part of another field), so fields do not form reference
+        # cycles with their containers and are freed as soon as they
+        # are not used.
         self.__name = name
-        self.__root = self
         self.__parent = None
-        self.__calibration = None
-
-        # Identity calibration
-        self.set_calibration_curve(lambda x: x)
+        self.__calibration = _identity
 
     def name(self):
         '''
@@ -168,16 +206,26 @@ class Field(object):
         '''
         Returns the root of this field. The root is the top level
         container that this field belongs to, if any. If the field is
-        not part of any other field the root is the field itself.
+        not part of any other field the root is the field itself. The
+        root is found by walking up the parents of the field.
         '''
-        return self.__root
+        field = self
+        parent = field.parent()
+        while parent is not None:
+            field = parent
+            parent = field.parent()
+        return field
 
     def parent(self):
         '''
         Returns the parent of this field, or None if the field is not
-        part of any other field.
+        part of any other field. Fields only keep a weak reference to
+        their parent, so this also returns None if the parent is not
+        used anymore.
         '''
-        return self.__parent
+        if self.__parent is not None:
+            return self.__parent()
+        return None
 
     def fields(self):
         '''
@@ -203,14 +251,14 @@ class Field(object):
         Returns the given *array* appended with the field byte
         representation to it.
         '''
-        return array.fromstring(self.bytes())
+        return array.frombytes(self.bytes())
 
     def set_array(self, array):
         '''
         Sets the given *array* bytes to the field. This function does
-        the same as calling *set_bytes* with the bytes of the array.
+        the same as calling *set_buffer* with the array.
         '''
-        self.set_bytes(array.tostring())
+        self.set_buffer(array)
 
     def bytes(self):
         '''
@@ -224,7 +272,33 @@ class Field(object):
         '''
         Sets a string of bytes to the field.
         '''
-        self.set_stream(BytesIO(bytes))
+        self.set_buffer(bytes)
+
+    def set_buffer(self, buffer, offset = 0):
+        '''
+        Sets the field with the contents of the given *buffer*,
+        starting at *offset*. *buffer* can be any object supporting the
+        buffer protocol (bytes, bytearray, memoryview, mmap,
+        array.array...) and it is not copied, fields holding strings of
+        bytes keep memoryview slices of it. This means that the buffer
+        should not be modified (or closed, for mmap objects) while the
+        field is in use. Returns the offset right after the bytes used
+        by this field.
+        '''
+        stream = BufferReader(buffer, offset)
+        self._decode(stream)
+        return stream.tell()
+
+    def encode_into(self, buffer, offset = 0):
+        '''
+        Writes the bytes representing this field into the given
+        writable *buffer* (bytearray, memoryview, mmap...) starting at
+        *offset*, without allocating intermediate strings of
+        bytes. Returns the offset right after the written bytes. A
+        *ValueError* exception is raised if the field does not fit in
+        the buffer.
+        '''
+        return self._encode_into(buffer_view(buffer), offset)
 
     def stream(self, stream):
         '''
@@ -323,6 +397,146 @@ class Field(object):
         '''
         raise NotImplementedError
 
+    def _encode_into(self, view, offset):
+        '''
+        Writes the field's value into the given unsigned byte memoryview
+        at *offset* and returns the offset after it. By default, this
+        uses *_encode* with a stream on top of the memoryview.
+        '''
+        stream = BufferWriter(view, offset)
+        self._encode(stream)
+        return stream.tell()
+
+    def _decode_resumable(self, stream):
+        '''
+        Returns a generator that converts the given byte stream into
+        the internal field representation. Whenever the stream does not
+        have enough data, the generator yields the number of missing
+        bytes and, once resumed (after more data has been added to the
+        stream), continues decoding from where it stopped. The stream
+        must support *tell()* and *seek()*. By default, the whole field
+        is decoded again after each resume.
+        '''
+        position = stream.tell()
+        while True:
+            try:
+                self._decode(stream)
+                return
+            except IncompleteDataError as err:
+                stream.seek(position)
+                yield err.missing
+
+    def _decode_lazy(self, stream):
+        '''
+        Converts the given byte stream into the internal field
+        representation, possibly deferring the real work until the
+        field is accessed. The stream must support random access and
+        its position after this call is undefined. By default this is
+        the same as *_decode*.
+        '''
+        self._decode(stream)
+
+    def _skip(self, stream):
+        '''
+        Moves the given byte stream past the bytes of this field,
+        without decoding it if possible. It is used to find the offset
+        of the fields that follow this one (e.g. when lazily decoding a
+        structure). By default, fields without a fixed size are
+        decoded.
+        '''
+        size = self._static_size()
+        if size is None:
+            self._decode(stream)
+        else:
+            read_stream(stream, size)
+
+    def _schema(self):
+        '''
+        Returns the immutable schema node (see :mod:`Schema`) that
+        decodes and encodes the values of this field. A *TypeError*
+        exception is raised if the field can not be compiled into a
+        schema.
+        '''
+        raise TypeError("Field '%s' can not be compiled into a schema" \
+                            % self.name())
+
+    def _static_size(self):
+        '''
+        Returns the size in bytes of the field if it is always the same
+        regardless of the field's value (i.e. it can be known before
+        decoding it), None otherwise.
+        '''
+        return None
+
+    def _layout(self, key, offset, layouts):
+        '''
+        Appends the layout of this field, identified by *key* and
+        placed at *offset* bytes, to the *layouts* list and returns the
+        offset right after the field. A *ValueError* exception is raised
+        if the field does not have a fixed size.
+        '''
+        size = self._static_size()
+        if size is None:
+            raise ValueError("Field '%s' does not have a fixed size" % key)
+        layouts.append(FieldLayout(key, offset, size, None, None))
+        return offset + size
+
+    def _peek(self, view, offset, layout):
+        '''
+        Returns the value of this field decoded from the given unsigned
+        byte memoryview at *offset*, where *layout* is the field's
+        :class:`FieldLayout`, without modifying the field.
+        '''
+        raise TypeError("Field '%s' can not be decoded from a layout" \
+                            % self.name())
+
+    def _patch(self, view, offset, layout, value):
+        '''
+        Encodes the given *value* directly into the given unsigned byte
+        memoryview at *offset*, where *layout* is the field's
+        :class:`FieldLayout`, without modifying the field.
+        '''
+        raise TypeError("Field '%s' can not be encoded into a layout" \
+                            % self.name())
+
+    def _struct_format(self):
+        '''
+        Returns the struct module format of this field if its value can
+        be packed and unpacked with a single struct format item, None
+        otherwise. Containers use it to compile consecutive fields into
+        a single struct call, so it should only return a format if the
+        field is encoded exactly like the format says.
+        '''
+        return None
+
+    def _shape(self):
+        '''
+        Returns a hashable description of the type and layout of this
+        field (but not of its name or value). Fields with the same shape
+        can be decoded in place of each other, so arrays use it to know
+        if an existing element can be reused.
+        '''
+        return (type(self), self._struct_format(), self._static_size())
+
+    def _size_notified(self):
+        '''
+        Returns True if the changes of the size of this field are
+        notified with *_size_changed()*, so containers can cache their
+        size. This is only the case for the *size()* methods of
+        BitPacket fields, the size of other fields (e.g. a user subclass
+        overriding *size()*) might change at any time.
+        '''
+        return type(self).size.__module__.startswith("BitPacket.")
+
+    def _size_changed(self):
+        '''
+        Called when the size of this field changes. Containers cache
+        their size, so the change is notified to the parent field.
+        '''
+        parent = self.parent()
+        if parent is not None:
+            parent._size_changed()
+
     def _set_name(self, name):
         '''
         Sets a new name to the field. This function is intended to be
@@ -331,23 +545,12 @@ class Field(object):
         '''
         self.__name = name
 
-    def _set_root(self, root):
-        '''
-        Sets the root of this field. The root is the top level container
-        that this field belongs to, or the field itself if the field is
-        not part of another field. This function is intended to be used
-        only by the library internals, so use it with care.
-        '''
-        self.__root = root
-        for f in self.fields():
-            f._set_root(root)
-
     def _set_parent(self, parent):
         '''
         Sets the parent of this field. This function is intended to be
         used only by the library internals, so use it with care.
         '''
-        self.__parent = parent
+        self.__parent = None if parent is None else weakref.ref(parent)
 
     def __str__(self):
         '''
@@ -355,6 +558,8 @@ class Field(object):
         this bit field. It uses :class:`WriterTextBasic` to obtain the
         resulting string.
         '''
+        # Writers are only imported when needed.
+        from BitPacket.writers.WriterTextBasic import WriterTextBasic
         writer = WriterTextBasic(StringIO())
         writer.write(self)
         return writer.stream().getvalue()
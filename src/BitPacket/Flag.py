@@ -67,6 +67,8 @@ class Flag(BitField):
     represent True and False values.
     '''
 
+    __slots__ = ()
+
     Inactive = 0
     Active = 1
 
@@ -125,21 +125,29 @@ __STRUCT_UINT64_BE_FMT__ = ">Q"
 
 class Int8LE(Value):
 
+    __slots__ = ()
+
     def __init__(self, name, value = 0):
         Value.__init__(self, name, __STRUCT_INT8_LE_FMT__, value)
 
 class UInt8LE(Value):
 
+    __slots__ = ()
+
     def __init__(self, name, value = 0):
         Value.__init__(self, name, __STRUCT_UINT8_LE_FMT__, value)
 
 class Int8BE(Value):
 
+    __slots__ = ()
+
     def __init__(self, name, value = 0):
         Value.__init__(self, name, __STRUCT_INT8_BE_FMT__, value)
 
 class UInt8BE(Value):
 
+    __slots__ = ()
+
     def __init__(self, name, value = 0):
         Value.__init__(self, name, __STRUCT_UINT8_BE_FMT__, value)
 
@@ -150,21 +158,29 @@ UInt8 = UInt8BE
 
 class Int16LE(Value):
 
+    __slots__ = ()
+
     def __init__(self, name, value = 0):
         Value.__init__(self, name, __STRUCT_INT16_LE_FMT__, value)
 
 class UInt16LE(Value):
 
+    __slots__ = ()
+
     def __init__(self, name, value = 0):
         Value.__init__(self, name, __STRUCT_UINT16_LE_FMT__, value)
 
 class Int16BE(Value):
 
+    __slots__ = ()
+
     def __init__(self, name, value = 0):
         Value.__init__(self, name, __STRUCT_INT16_BE_FMT__, value)
 
 class UInt16BE(Value):
 
+    __slots__ = ()
+
     def __init__(self, name, value = 0):
         Value.__init__(self, name, __STRUCT_UINT16_BE_FMT__, value)
 
@@ -175,21 +191,29 @@ UInt16 = UInt16BE
 
 class Int32LE(Value):
 
+    __slots__ = ()
+
     def __init__(self, name, value = 0):
         Value.__init__(self, name, __STRUCT_INT32_LE_FMT__, value)
 
 class UInt32LE(Value):
 
+    __slots__ = ()
+
     def __init__(self, name, value = 0):
         Value.__init__(self, name, __STRUCT_UINT32_LE_FMT__, value)
 
 class Int32BE(Value):
 
+    __slots__ = ()
+
     def __init__(self, name, value = 0):
         Value.__init__(self, name, __STRUCT_INT32_BE_FMT__, value)
 
 class UInt32BE(Value):
 
+    __slots__ = ()
+
     def __init__(self, name, value = 0):
         Value.__init__(self, name, __STRUCT_UINT32_BE_FMT__, value)
 
@@ -200,21 +224,29 @@ UInt32 = UInt32BE
 
 class Int64LE(Value):
 
+    __slots__ = ()
+
     def __init__(self, name, value = 0):
         Value.__init__(self, name, __STRUCT_INT64_LE_FMT__, value)
 
 class UInt64LE(Value):
 
+    __slots__ = ()
+
     def __init__(self, name, value = 0):
         Value.__init__(self, name, __STRUCT_UINT64_LE_FMT__, value)
 
 class Int64BE(Value):
 
+    __slots__ = ()
+
     def __init__(self, name, value = 0):
         Value.__init__(self, name, __STRUCT_INT64_BE_FMT__, value)
 
 class UInt64BE(Value):
 
+    __slots__ = ()
+
     def __init__(self, name, value = 0):
         Value.__init__(self, name, __STRUCT_UINT64_BE_FMT__, value)
 
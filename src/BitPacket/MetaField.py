@@ -36,14 +36,18 @@ from BitPacket.Field import Field
 
 class MetaField(Field):
 
+    __slots__ = ("_field", "_fieldfunc")
+
     @staticmethod
     def _raise_error(instance):
         raise TypeError("No field created for MetaField '%s'" % instance.name())
 
     @staticmethod
     def _non_proxyable():
-        return ["_field", "_fieldfunc", "_create_field",
-                "_encode", "_decode", "_set_name", "write"]
+        return ["_field", "_fieldfunc", "_field_created", "_create_field",
+                "_encode", "_decode", "_decode_lazy", "_decode_resumable",
+                "_layout", "_patch", "_peek", "_schema", "_set_name",
+                "_shape", "_skip", "_static_size", "_struct_format", "write"]
 
     def __init__(self, name,  fieldfunc):
         Field.__init__(self, name)
@@ -64,8 +68,24 @@ class MetaField(Field):
 
     def _decode(self, stream):
         self._field = self._create_field()
+        self._field_created()
         self._field._decode(stream)
 
+    def _decode_resumable(self, stream):
+        self._field = self._create_field()
+        self._field_created()
+        for missing in self._field._decode_resumable(stream):
+            yield missing
+
+    def _field_created(self):
+        '''
+        Notifies the parent that this field has been replaced by the
+        real field.
+        '''
+        parent = self.parent()
+        if parent is not None:
+            parent._fields_changed()
+
     def _create_field(self):
         # Call name(), root() and parent() before proxy is
         # available.
@@ -74,7 +94,6 @@ class MetaField(Field):
         parent = self.parent()
         field = self._fieldfunc(root)
         field._set_name(name)
-        field._set_root(root)
         field._set_parent(parent)
         return field
 
@@ -0,0 +1,417 @@
+#!/usr/bin/env python
+#
+# @file    NumericArray.py
+# @brief   An array of numeric values of the same type
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 20:14
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+__doc__ = '''
+
+    NumericArray field
+    ==================
+
+    An array of numeric values of the same type.
+
+    **API reference**: :class:`NumericArray`
+
+    An :mod:`Array` of numeric fields (e.g. samples of a signal) has a
+    field for each element. A :mod:`NumericArray` holds the same
+    values in a Python *array.array* instead. The whole array is
+    decoded and encoded at once (swapping the bytes of all the values
+    if the byte order of the elements is not the native one).
+
+    As with :mod:`Array`, a length field holds the number of elements,
+    but instead of a function that creates the elements we give the
+    numeric type of the elements:
+
+    >>> samples = NumericArray("samples", UInt8("count"), UInt16LE)
+    >>> samples.set_bytes(b"\\x03\\x01\\x00\\x02\\x00\\x03\\x00")
+    >>> samples.value()
+    array('H', [1, 2, 3])
+
+    Elements can still be accessed by their index:
+
+    >>> samples["1"]
+    2
+    >>> samples["1"] = 20
+    >>> print(samples)
+    (samples =
+      (count = 3)
+      (0 = 1)
+      (1 = 20)
+      (2 = 3))
+
+    Element fields are only created when they are needed (e.g. to
+    access an element by its key or to write the array), and they are
+    views of the values in the array, so decoding a new array with the
+    same number of elements does not create any field.
+
+    New elements are appended as in an :mod:`Array`:
+
+    >>> samples.append(UInt16LE("sample", 4))
+    >>> samples["4"] = 5
+    >>> samples.value()
+    array('H', [1, 20, 3, 4, 5])
+
+    Only :mod:`Value` fields with a single integer or real number (and
+    a size supported by *array.array*) can be array elements.
+
+'''
+
+import array
+import sys
+
+from BitPacket.utils.compatibility import *
+
+from BitPacket.utils.string import hex_string
+from BitPacket.utils.stream import check_buffer, read_stream, write_stream
+
+from BitPacket.Array import _element_name
+from BitPacket.Container import Container, FIELD_SEPARATOR
+from BitPacket.Field import Field, _custom_codec
+from BitPacket.Schema import ArrayNode
+from BitPacket.Structure import Structure
+from BitPacket.Value import _value_struct
+
+# array.array typecodes that can hold each kind of struct format item.
+__NUMERIC_ARRAY_TYPECODES__ = { "b" : "bhilq", "h" : "bhilq", "i" : "bhilq",
+                                "l" : "bhilq", "q" : "bhilq",
+                                "B" : "BHILQ", "H" : "BHILQ", "I" : "BHILQ",
+                                "L" : "BHILQ", "Q" : "BHILQ",
+                                "f" : "fd", "d" : "fd" }
+
+# Byte order of the struct format prefixes.
+__NUMERIC_ARRAY_BYTE_ORDERS__ = { "<" : "little", ">" : "big", "!" : "big",
+                                  "=" : sys.byteorder, "@" : sys.byteorder }
+
+def _array_typecode(format):
+    '''
+    Returns a tuple with the array.array typecode that holds the values
+    of the given struct *format* and whether the bytes of the values
+    need to be swapped, or None if the format can not be held by an
+    array.array.
+    '''
+    order = __NUMERIC_ARRAY_BYTE_ORDERS__.get(format[:1])
+    typecodes = __NUMERIC_ARRAY_TYPECODES__.get(format[1:])
+    if order is None or typecodes is None:
+        return None
+    size = _value_struct(format).size
+    for typecode in typecodes:
+        if array.array(typecode).itemsize == size:
+            return (typecode, order != sys.byteorder)
+    return None
+
+class NumericArrayElement(Field):
+    '''
+    A field that gives access to an element of a :mod:`NumericArray`
+    by its index. It behaves like a :mod:`Value` field, but its value
+    is kept by the array.
+    '''
+
+    __slots__ = ("__index", "__struct")
+
+    def __init__(self, name, index, format):
+        '''
+        Initialize the field with the given *name* for the element at
+        *index*, with the given struct *format*.
+        '''
+        Field.__init__(self, name)
+        self.__index = index
+        self.__struct = _value_struct(format)
+
+    def _encode(self, stream):
+        write_stream(stream, self.__struct.size,
+                     self.__struct.pack(self.value()))
+
+    def _decode(self, stream):
+        data = read_stream(stream, self.__struct.size)
+        self.set_value(self.__struct.unpack(data)[0])
+
+    def _static_size(self):
+        return self.__struct.size
+
+    def value(self):
+        '''
+        Returns the numeric value of this element.
+        '''
+        return self.parent()._element(self.__index)
+
+    def set_value(self, value):
+        '''
+        Sets the new numeric *value* to this element. The value must
+        fit in the array, otherwise an exception is raised.
+        '''
+        self.parent()._set_element(self.__index, value)
+
+    def hex_value(self):
+        '''
+        Returns the hexadecimal integer representation of this element
+        (see :func:`Value.hex_value`).
+        '''
+        value = 0
+        for c in self.__struct.pack(self.value()):
+            value = (value << 8) + u_ord(c)
+        return value
+
+    def size(self):
+        '''
+        Returns the size in bytes of this element.
+        '''
+        return self.__struct.size
+
+    def str_value(self):
+        '''
+        Returns a human-readable representation of the numeric value of
+        this element.
+        '''
+        return str(self.value())
+
+    def str_hex_value(self):
+        '''
+        Returns a human-readable representation of the hexadecimal
+        representation of this element.
+        '''
+        return hex_string(self.hex_value(), self.size())
+
+    def str_eng_value(self):
+        '''
+        Returns a human-readable representation of the engineering
+        value of this element.
+        '''
+        return str(self.eng_value())
+
+class NumericArray(Structure):
+    '''
+    A :mod:`NumericArray` is an array of numeric values of the same
+    type kept in an *array.array*. Like an :mod:`Array`, it contains a
+    length field with the number of elements, followed by the
+    elements.
+    '''
+
+    __slots__ = ("__length", "__valuetype", "__format", "__values",
+                 "__swap")
+
+    def __init__(self, name, lengthfield, valuetype):
+        '''
+        Initialize the array with the given *name*, a *lengthfield* for
+        the counter field and the :mod:`Value` subclass of the elements
+        as *valuetype* (e.g. :class:`UInt16LE`). A *TypeError*
+        exception is raised if the values of the given type can not be
+        kept in an *array.array*.
+        '''
+        Structure.__init__(self, name)
+
+        format = valuetype("value")._struct_format()
+        typecode = _array_typecode(format) if format else None
+        if typecode is None:
+            raise TypeError("Invalid value type for numeric array '%s' "
+                            "(%s)" % (name, valuetype))
+
+        self.__length = lengthfield
+        self.__valuetype = valuetype
+        self.__format = format
+        self.__values = array.array(typecode[0])
+        self.__swap = typecode[1]
+
+        Structure.append(self, self.__length)
+
+    def _decode(self, stream):
+        self.__length._decode(stream)
+        length = self.__length.value()
+        count = len(self.__values)
+
+        data = read_stream(stream, length * self.__values.itemsize)
+        values = array.array(self.__values.typecode)
+        values.frombytes(data)
+        if self.__swap:
+            values.byteswap()
+        self.__values = values
+
+        if length != count:
+            self.__resized()
+
+    def _decode_resumable(self, stream):
+        # The whole array is decoded again after each resume.
+        return Field._decode_resumable(self, stream)
+
+    def _decode_lazy(self, stream):
+        self._decode(stream)
+
+    def _skip(self, stream):
+        self.__length._decode(stream)
+        read_stream(stream, self.__length.value() * self.__values.itemsize)
+
+    def _encode(self, stream):
+        self.__length._encode(stream)
+        data = self.__bytes()
+        write_stream(stream, len(data), data)
+
+    def _encode_into(self, view, offset):
+        offset = self.__length._encode_into(view, offset)
+        data = self.__bytes()
+        check_buffer(view, offset, len(data))
+        view[offset:offset + len(data)] = data
+        return offset + len(data)
+
+    def __bytes(self):
+        '''
+        Returns the elements in their byte order, as a memoryview of
+        bytes.
+        '''
+        values = self.__values
+        if self.__swap:
+            values = array.array(values.typecode, values)
+            values.byteswap()
+        return memoryview(values).cast("B")
+
+    def _schema(self):
+        if _custom_codec(self, NumericArray):
+            return Field._schema(self)
+        return ArrayNode(self.name(), self.__length._schema(),
+                         self.__valuetype("value")._schema())
+
+    def _static_size(self):
+        return None
+
+    def _shape(self):
+        return (type(self), self.__length._shape(), self.__format)
+
+    def _element(self, index):
+        return self.__values[index]
+
+    def _set_element(self, index, value):
+        self.__values[index] = value
+
+    def __resized(self):
+        '''
+        Called when the number of elements changes. The element fields
+        already created are updated to the new number of elements.
+        '''
+        if len(Container.fields(self)) > 1:
+            self.__elements()
+        else:
+            # The keys and the size of the containers change even if
+            # no element field has been created.
+            self._fields_changed()
+
+    def __elements(self):
+        '''
+        Makes sure that there is an element field for each value.
+        '''
+        count = len(Container.fields(self)) - 1
+        length = len(self.__values)
+        if count < length:
+            self._extend([NumericArrayElement(_element_name(i), i,
+                                              self.__format)
+                          for i in range(count, length)])
+        elif count > length:
+            self._truncate(length + 1)
+
+    def fields(self):
+        '''
+        Returns the list of fields of this array: the length field and
+        an element field for each value.
+        '''
+        self.__elements()
+        return Structure.fields(self)
+
+    def _child(self, name):
+        if name != self.__length.name():
+            self.__elements()
+        return Structure._child(self, name)
+
+    def _child_at(self, index):
+        if index > 0:
+            self.__elements()
+        return Structure._child_at(self, index)
+
+    def append(self, field):
+        '''
+        Appends the value of the given *field* to the array. The given
+        *field* must be an instance of the type of the elements,
+        otherwise a *TypeError* exception is raised.
+        '''
+        if not isinstance(field, self.__valuetype):
+            raise TypeError("Invalid field type for numeric array '%s' "
+                            "(expected %s, got %s)" \
+                                % (self.name(), self.__valuetype,
+                                   type(field)))
+        self.__length.set_value(len(self.__values) + 1)
+        self.__values.append(field.value())
+        self.__resized()
+
+    def reset(self):
+        '''
+        Removes all the elements from the array.
+        '''
+        self.set_value([])
+
+    def value(self):
+        '''
+        Returns the *array.array* with the values of the elements. The
+        array is used by this field, so it should not be resized.
+        '''
+        return self.__values
+
+    def set_value(self, value):
+        '''
+        Sets the values of the elements from the given sequence of
+        numbers. A *ValueError* exception is raised if the number of
+        elements does not fit in the length field.
+        '''
+        values = array.array(self.__values.typecode, value)
+        try:
+            self.__length.set_value(len(values))
+        except:
+            raise ValueError("Number of elements must be lower than length "
+                             "field maximum size (%d given)" % len(values))
+        count = len(self.__values)
+        self.__values = values
+        if len(values) != count:
+            self.__resized()
+
+    def size(self):
+        '''
+        Returns the size of the array in bytes (including the length
+        field).
+        '''
+        return self.__length.size() \
+            + len(self.__values) * self.__values.itemsize
+
+    def __len__(self):
+        '''
+        Returns the number of fields in this array (the length field
+        and the elements).
+        '''
+        return len(self.__values) + 1
+
+    def __setitem__(self, name, value):
+        '''
+        Sets the given *value* to the element identified by *name* (its
+        index). If the index is the length of the array, the value is
+        appended.
+        '''
+        names = name.split(FIELD_SEPARATOR, 1)
+        if names[0] != self.__length.name() \
+                and int(names[0]) == len(self.__values):
+            self.append(self.__valuetype("value", value))
+        else:
+            Structure.__setitem__(self, name, value)
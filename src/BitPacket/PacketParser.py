@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+#
+# @file    PacketParser.py
+# @brief   An incremental parser of packets for partial data
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 11:03
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+__doc__ = '''
+
+    Packet parsers
+    ==============
+
+    An incremental parser of packets for partial data.
+
+    **API reference**: :class:`PacketParser`
+
+    Data coming from a TCP connection or a serial link arrives in
+    pieces that do not necessarily match packet boundaries. A
+    :mod:`PacketParser` is fed with these pieces of data and returns
+    packets as soon as they are complete. Partially received packets
+    are not decoded again from the beginning when more data arrives,
+    decoding continues from the field where it stopped.
+
+    A :mod:`PacketParser` is created with a function without arguments
+    that creates a new packet, for example a :mod:`Structure` subclass:
+
+    >>> class MyStructure(Structure):
+    ...    def __init__(self):
+    ...        Structure.__init__(self, "mystructure")
+    ...        self.append(UInt8("id"))
+    ...        self.append(Data("data", UInt8("length")))
+    ...
+    >>> parser = PacketParser(MyStructure)
+
+    Each call to :func:`PacketParser.feed` returns a list of tuples with
+    the offset of each completed packet (since the first fed byte) and
+    the packet itself:
+
+    >>> parser.feed(b"\\x01\\x03ab")
+    []
+    >>> for offset, packet in parser.feed(b"c\\x02\\x00"):
+    ...     print("%d %d %d" % (offset, packet["id"], packet["data.length"]))
+    0 1 3
+    5 2 0
+
+    If a packet can not be decoded (i.e. its decoding raises an
+    exception other than running out of data), the exception is raised
+    by :func:`PacketParser.feed` and all the data fed so far is
+    discarded, as the start of the next packet can not be known. The
+    parser starts a new packet with the next fed data (offsets still
+    count all the fed bytes). Packets completed in the same call before
+    the failed one are lost, so data should be fed as it arrives.
+
+'''
+
+from BitPacket.utils.stream import ChunkReader
+
+class PacketParser(object):
+    '''
+    A push parser that decodes packets from pieces of data as they
+    arrive.
+    '''
+
+    def __init__(self, fieldfunc):
+        '''
+        Initialize the parser with *fieldfunc*, a function without
+        arguments that returns a new packet (e.g. a :mod:`Structure`
+        subclass).
+        '''
+        self.__fieldfunc = fieldfunc
+        self.__stream = ChunkReader()
+        self.__packet = None
+        self.__decoder = None
+        self.__offset = 0
+        self.__missing = 0
+
+    def missing(self):
+        '''
+        Returns the number of bytes that are known to be missing to
+        complete the current packet. This is a lower bound, as more
+        fields might be needed after these bytes arrive.
+        '''
+        return self.__missing
+
+    def pending(self):
+        '''
+        Returns True if a packet has been partially decoded or there is
+        data that has not been decoded yet.
+        '''
+        return self.__decoder is not None or self.__stream.available() > 0
+
+    def feed(self, data):
+        '''
+        Adds the given *data* (any bytes-like object) to the parser and
+        returns a list of tuples with the offset and the packet of all
+        the packets that have been completed. If a packet can not be
+        decoded, the exception raised by the packet is raised again and
+        all the data fed so far is discarded.
+        '''
+        stream = self.__stream
+        stream.append(data)
+
+        packets = []
+        while stream.available() > 0 or self.__decoder is not None:
+            try:
+                if self.__decoder is None:
+                    self.__offset = stream.tell()
+                    self.__packet = self.__fieldfunc()
+                    self.__decoder = self.__packet._decode_resumable(stream)
+                try:
+                    self.__missing = next(self.__decoder)
+                    break
+                except StopIteration:
+                    pass
+                if stream.tell() == self.__offset:
+                    raise ValueError("Empty packets can not be parsed")
+            except:
+                self.__reset()
+                raise
+            packets.append((self.__offset, self.__packet))
+            self.__packet = None
+            self.__decoder = None
+            self.__missing = 0
+            stream.discard()
+        return packets
+
+    def __reset(self):
+        '''
+        Drops the current packet and all the pending data, so parsing
+        starts again with the next fed data.
+        '''
+        self.__packet = None
+        self.__decoder = None
+        self.__missing = 0
+        self.__stream.seek(0, 2)
+        self.__stream.discard()
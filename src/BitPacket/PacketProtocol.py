@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+#
+# @file    PacketProtocol.py
+# @brief   An asyncio datagram protocol for BitPacket packets
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 11:48
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+__doc__ = '''
+
+    asyncio integration
+    ===================
+
+    An asyncio datagram protocol for BitPacket packets.
+
+    **API reference**: :class:`PacketDatagramProtocol`,
+    :func:`read_packet`
+
+    This module needs Python 3.5 or later.
+
+    BitPacket fields can be decoded without blocking from asyncio
+    streams with :func:`read_packet`, which only reads from an asyncio
+    StreamReader the bytes that are needed (the examples below run
+    inside an asyncio event loop)::
+
+        async def handle(reader, writer):
+            while True:
+                packet = MyStructure()
+                await read_packet(packet, reader)
+                process(packet)
+
+    For datagram endpoints, :mod:`PacketDatagramProtocol` decodes each
+    received datagram into a new packet. Subclasses only need to
+    implement :func:`PacketDatagramProtocol.packet_received`. Datagrams
+    that can not be decoded, or that have bytes left after the packet,
+    are given to :func:`PacketDatagramProtocol.packet_error`::
+
+        class MyProtocol(PacketDatagramProtocol):
+            def __init__(self):
+                PacketDatagramProtocol.__init__(self, MyStructure)
+
+            def packet_received(self, packet, addr):
+                process(packet)
+
+        loop = asyncio.get_running_loop()
+        transport, protocol = await loop.create_datagram_endpoint(
+            MyProtocol, local_addr = ("127.0.0.1", 9999))
+
+'''
+
+import asyncio
+
+from BitPacket.utils.stream import ChunkReader
+
+async def read_packet(packet, reader):
+    '''
+    Sets the given *packet* (any field) with data read from the given
+    asyncio StreamReader (or any object with an awaitable
+    *readexactly(n)* method). Only the bytes needed by the packet are
+    read, as they are needed, so the reader is left right after the
+    packet. An asyncio.IncompleteReadError exception is raised if the
+    reader reaches the end of the stream before the packet is
+    complete.
+    '''
+    stream = ChunkReader()
+    for missing in packet._decode_resumable(stream):
+        stream.append(await reader.readexactly(missing))
+
+class PacketDatagramProtocol(asyncio.DatagramProtocol):
+    '''
+    An asyncio datagram protocol that decodes each received datagram
+    into a new packet.
+    '''
+
+    def __init__(self, fieldfunc):
+        '''
+        Initialize the protocol with *fieldfunc*, a function without
+        arguments that returns a new packet (e.g. a :mod:`Structure`
+        subclass).
+        '''
+        self.__fieldfunc = fieldfunc
+        self.__transport = None
+
+    def transport(self):
+        '''
+        Returns the transport of this protocol, or None if the
+        connection has not been made yet.
+        '''
+        return self.__transport
+
+    def connection_made(self, transport):
+        self.__transport = transport
+
+    def connection_lost(self, exc):
+        self.__transport = None
+
+    def datagram_received(self, data, addr):
+        packet = self.__fieldfunc()
+        try:
+            end = packet.set_buffer(data)
+            if end != len(data):
+                raise ValueError("Datagram has %d bytes after the packet" \
+                                     % (len(data) - end))
+        except ValueError as err:
+            self.packet_error(err, data, addr)
+        else:
+            self.packet_received(packet, addr)
+
+    def send_packet(self, packet, addr = None):
+        '''
+        Sends the given *packet* to *addr* (or to the connected remote
+        address if None).
+        '''
+        self.__transport.sendto(packet.bytes(), addr)
+
+    def packet_received(self, packet, addr):
+        '''
+        Called with each decoded *packet* and the address *addr* of the
+        sender. Subclasses must implement this method.
+        '''
+        raise NotImplementedError
+
+    def packet_error(self, error, data, addr):
+        '''
+        Called when a datagram *data* received from *addr* could not be
+        decoded, or when it has bytes left after the packet, with the
+        *error* raised. By default, the error is
+        raised again (and thus reported by the event loop).
+        '''
+        raise error
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+#
+# @file    PacketReader.py
+# @brief   An iterator of packets read from a byte stream
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 10:12
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+__doc__ = '''
+
+    Packet readers
+    ==============
+
+    An iterator of packets read from a byte stream.
+
+    **API reference**: :class:`PacketReader`
+
+    Decoding a field directly from a stream (see
+    :func:`Field.set_stream`) reads the stream field by field, which is
+    slow for unbuffered streams such as pipes or sockets. A
+    :mod:`PacketReader` reads big chunks of data from the stream instead
+    and decodes packets from them, one after the other.
+
+    A :mod:`PacketReader` is created with a byte stream and a function
+    without arguments that creates a new packet, for example a
+    :mod:`Structure` subclass:
+
+    >>> class MyStructure(Structure):
+    ...    def __init__(self):
+    ...        Structure.__init__(self, "mystructure")
+    ...        self.append(UInt8("id"))
+    ...        self.append(UInt16("address"))
+    ...
+    >>> stream = BytesIO(b"\\x01\\x00\\x02\\x03\\x00\\x04\\x05")
+    >>> reader = PacketReader(stream, MyStructure)
+
+    Iterating the reader returns the offset of each packet in the
+    stream and the packet itself:
+
+    >>> for offset, packet in reader:
+    ...     print("%d %d %d" % (offset, packet["id"], packet["address"]))
+    0 1 2
+    3 3 4
+
+    If the stream ends in the middle of a packet, the iteration simply
+    stops. The bytes of the incomplete packet can be obtained
+    afterwards:
+
+    >>> reader.remainder() == b"\\x05"
+    True
+
+'''
+
+from BitPacket.utils.stream import BufferReader, IncompleteDataError
+
+# Default number of bytes read at once from the stream.
+__PACKET_READER_BUFSIZE__ = 65536
+
+class PacketReader(object):
+    '''
+    An iterator that reads packets from a byte stream. Data is read
+    from the stream in big chunks and each packet is decoded from the
+    buffered data.
+    '''
+
+    def __init__(self, stream, fieldfunc,
+                 bufsize = __PACKET_READER_BUFSIZE__):
+        '''
+        Initialize the reader with the given byte *stream* and
+        *fieldfunc*, a function without arguments that returns a new
+        packet (e.g. a :mod:`Structure` subclass). *bufsize* is the
+        number of bytes requested at once from the stream. If the
+        stream has a *read1()* method (e.g. buffered streams from
+        *io.open()* or *socket.makefile()*), it is used so that only the
+        available bytes are read instead of waiting for all of them.
+        '''
+        self.__read = getattr(stream, "read1", None) or stream.read
+        self.__fieldfunc = fieldfunc
+        self.__bufsize = bufsize
+        self.__data = b""
+        self.__pos = 0
+        self.__offset = 0
+        self.__eof = False
+
+    def offset(self):
+        '''
+        Returns the offset in the stream right after the last decoded
+        packet.
+        '''
+        return self.__offset + self.__pos
+
+    def remainder(self):
+        '''
+        Returns the bytes read from the stream that have not been
+        decoded yet. Once the iteration is finished, these are the bytes
+        of an incomplete trailing packet, if any.
+        '''
+        return self.__data[self.__pos:]
+
+    def __iter__(self):
+        '''
+        Returns a generator of tuples with the offset of each packet in
+        the stream and the decoded packet.
+        '''
+        while True:
+            if self.__pos == len(self.__data):
+                if self.__eof or not self.__fill(self.__bufsize):
+                    return
+            packet = self.__fieldfunc()
+            reader = BufferReader(self.__data, self.__pos)
+            try:
+                packet._decode(reader)
+            except IncompleteDataError:
+                # Read, at least, as much as we already have pending so
+                # big packets are not decoded too many times.
+                pending = len(self.__data) - self.__pos
+                if self.__eof or not self.__fill(max(self.__bufsize,
+                                                     pending)):
+                    return
+                continue
+            if reader.tell() == self.__pos:
+                raise ValueError("Empty packets can not be read from a "
+                                 "stream")
+            offset = self.offset()
+            self.__pos = reader.tell()
+            yield (offset, packet)
+
+    def __fill(self, size):
+        '''
+        Reads up to *size* more bytes from the stream. Returns False if
+        the end of the stream is reached.
+        '''
+        chunk = self.__read(size)
+        if not chunk:
+            self.__eof = True
+            return False
+        # Packets might keep slices of the current data, so a new bytes
+        # object is always created instead of reusing a buffer.
+        self.__data = self.__data[self.__pos:] + chunk
+        self.__offset += self.__pos
+        self.__pos = 0
+        return True
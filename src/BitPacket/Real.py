@@ -91,11 +91,15 @@ __STRUCT_DOUBLE_BE_FMT__ = ">d"
 
 class FloatLE(Value):
 
+    __slots__ = ()
+
     def __init__(self, name, value = 0.0):
         Value.__init__(self, name, __STRUCT_FLOAT_LE_FMT__, value)
 
 class FloatBE(Value):
 
+    __slots__ = ()
+
     def __init__(self, name, value = 0.0):
         Value.__init__(self, name, __STRUCT_FLOAT_BE_FMT__, value)
 
@@ -105,11 +109,15 @@ Float = FloatBE
 
 class DoubleLE(Value):
 
+    __slots__ = ()
+
     def __init__(self, name, value = 0.0):
         Value.__init__(self, name, __STRUCT_DOUBLE_LE_FMT__, value)
 
 class DoubleBE(Value):
 
+    __slots__ = ()
+
     def __init__(self, name, value = 0.0):
         Value.__init__(self, name, __STRUCT_DOUBLE_BE_FMT__, value)
 
@@ -0,0 +1,785 @@
+#!/usr/bin/env python
+#
+# @file    Schema.py
+# @brief   Immutable packet schemas and records of decoded values
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 16:20
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+__doc__ = '''
+
+    Schemas
+    =======
+
+    Immutable packet schemas and records of decoded values.
+
+    **API reference**: :class:`Schema`, :class:`Record`
+
+    A packet built with fields is both the definition of the packet and
+    its data, so a new tree of fields is created for each decoded
+    packet. A :mod:`Schema` is compiled once from a packet definition
+    and decodes packets into a :class:`Record`, an immutable object
+    that only holds the decoded values and shares the schema with all
+    the other records.
+
+    >>> class MyStructure(Structure):
+    ...    def __init__(self):
+    ...        Structure.__init__(self, "mystructure")
+    ...        self.append(UInt8("id"))
+    ...        self.append(UInt16("sequence"))
+    ...        self.append(Data("data", UInt8("length")))
+    ...
+    >>> schema = Schema(MyStructure())
+
+    Records are accessed with the same keys than containers:
+
+    >>> record = schema.decode(b"\\x01\\x00\\x07\\x03abc")
+    >>> record["id"], record["sequence"], record["data"] == b"abc"
+    (1, 7, True)
+    >>> record.keys()
+    ['id', 'sequence', 'data.length', 'data.Data']
+
+    And they can be encoded back:
+
+    >>> schema.encode(record) == b"\\x01\\x00\\x07\\x03abc"
+    True
+
+    Records can be shared between threads, as they can not be
+    modified. Only fields whose size does not depend on other fields,
+    or depends on a length field inside them (:mod:`Array` and
+    :mod:`Data`), can be compiled into a schema. A *TypeError*
+    exception is raised otherwise (e.g. for a :mod:`MetaField`).
+
+
+    Schema nodes
+    ------------
+
+    A schema is a tree of immutable nodes (one for each field of the
+    packet definition) that know how to decode and encode the values of
+    their field. Fields provide their node with *_schema()*.
+
+
+    Compiled schemas
+    ----------------
+
+    Nodes can also generate the source code of a single function that
+    decodes (or encodes) the whole packet, without any method call per
+    field (see :mod:`SchemaCompiler`). Compiled schemas are created
+    with *compiled* set to True:
+
+    >>> schema = Schema(MyStructure(), compiled = True)
+    >>> schema.decode(b"\\x01\\x00\\x07\\x03abc")["data"] == b"abc"
+    True
+
+    The generated functions are cached by the fingerprint of the schema
+    (see :func:`Schema.fingerprint`), so they are only generated once
+    for all the schemas with the same nodes. They can also be saved in
+    a directory to be used by other processes (see :mod:`SchemaCache`).
+
+'''
+
+import struct
+
+from collections import namedtuple
+
+from BitPacket.utils.binary import bit_mask, bytes_to_int, int_to_bytes
+from BitPacket.utils.packing import merge_runs, run_key
+from BitPacket.utils.stream import buffer_view, check_buffer
+
+from BitPacket.Field import Field, FIELD_SEPARATOR
+from BitPacket.SchemaCompiler import SchemaCompiler
+
+# Compiled schemas by fingerprint: the root node and its generated
+# decode and encode functions.
+__SCHEMA_FUNCTIONS__ = {}
+
+def _segments(children):
+    '''
+    Returns a tuple of segments to decode and encode the given
+    *children* nodes. Each segment is a tuple with a struct.Struct and
+    the indexes of the consecutive value nodes it packs, or None and
+    the index of any other node.
+    '''
+    segments = []
+    for packer, indexes in merge_runs([(_value_format(c), i)
+                                       for i, c in enumerate(children)]):
+        if packer is None:
+            segments.append((None, indexes[0]))
+        else:
+            segments.append((packer, tuple(indexes)))
+    return tuple(segments)
+
+def _check_length(data, length):
+    '''
+    Raises a *ValueError* exception if the given *data* does not have
+    the given *length*.
+    '''
+    if len(data) != length:
+        raise ValueError("Data length must be %d (%d given)" \
+                             % (length, len(data)))
+
+def _value_format(node):
+    '''
+    Returns the struct format of the given *node* if it is a value
+    node, None otherwise.
+    '''
+    if isinstance(node, ValueNode):
+        return node.struct.format
+    return None
+
+def _value_key(node):
+    '''
+    Returns the byte order and the format item of the given *node* if
+    it is a value node that can be merged with others in a single
+    struct call (see *run_key()*), None otherwise.
+    '''
+    format = _value_format(node)
+    return run_key(format) if format else None
+
+def _fingerprint(node):
+    '''
+    Returns a string that describes the given schema *node* and all
+    its children, so nodes with the same description decode and encode
+    the same way.
+    '''
+    items = []
+    for name, value in zip(node._fields, node):
+        if name in ("index", "segments"):
+            continue
+        if isinstance(value, struct.Struct):
+            value = repr(value.format)
+        elif isinstance(value, tuple) and hasattr(value, "_fields"):
+            value = _fingerprint(value)
+        elif isinstance(value, tuple):
+            value = "(%s)" % ", ".join([_fingerprint(v) for v in value])
+        else:
+            value = repr(value)
+        items.append(value)
+    return "%s(%s)" % (type(node).__name__, ", ".join(items))
+
+def _check_source(compiler, size):
+    '''
+    Generates the code that checks that the view has *size* more bytes
+    (a number or the name of a variable) after the current offset.
+    '''
+    compiler.line("if offset + %s > length:" % size)
+    compiler.indent()
+    compiler.line("%s(view, offset, %s)" \
+                      % (compiler.constant(check_buffer), size))
+    compiler.dedent()
+
+def _compile(node):
+    '''
+    Returns a tuple with the generated decode and encode functions of
+    the given root *node*.
+    '''
+    compiler = SchemaCompiler("decode", ["view", "offset"])
+    compiler.line("length = len(view)")
+    compiler.line("if offset < 0:")
+    compiler.indent()
+    compiler.line("%s(view, offset, 0)" % compiler.constant(check_buffer))
+    compiler.dedent()
+    value = node._decode_source(compiler)
+    compiler.line("return %s, offset" % value)
+    decode = compiler.function()
+
+    compiler = SchemaCompiler("encode", ["record"])
+    compiler.line("parts = []")
+    node._encode_source(compiler, "record")
+    compiler.line("return b\"\".join(parts)")
+    encode = compiler.function()
+
+    return decode, encode
+
+class Record(object):
+    '''
+    The immutable values of a decoded container. Values are obtained
+    by key, like in a :mod:`Container`.
+    '''
+
+    __slots__ = ("__node", "__values")
+
+    def __init__(self, node, values):
+        '''
+        Initialize the record for the given schema *node* with its
+        tuple of *values* (one for each child node, records for
+        containers).
+        '''
+        self.__node = node
+        self.__values = values
+
+    def node(self):
+        '''
+        Returns the schema node of this record.
+        '''
+        return self.__node
+
+    def name(self):
+        '''
+        Returns the name of the field this record comes from.
+        '''
+        return self.__node.name
+
+    def values(self):
+        '''
+        Returns the tuple of values of the direct children of this
+        record (records for containers).
+        '''
+        return self.__values
+
+    def keys(self):
+        '''
+        Returns the list of keys of all the values recursively, as
+        :func:`Container.keys` does.
+        '''
+        keys = []
+        self.__keys("", keys)
+        return keys
+
+    def __keys(self, prefix, keys):
+        for name, value in self.__node.items(self.__values):
+            if isinstance(value, Record):
+                value.__keys(prefix + name + FIELD_SEPARATOR, keys)
+            else:
+                keys.append(prefix + name)
+
+    def __getitem__(self, key):
+        '''
+        Returns the value identified by *key* (which accepts a dot (.)
+        separator for values inside other containers). If the value does
+        not exist a *KeyError* exception is raised.
+        '''
+        value = self
+        try:
+            for name in key.split(FIELD_SEPARATOR):
+                value = value.__values[value.__node.position(name)]
+        except (AttributeError, IndexError, KeyError, ValueError):
+            raise KeyError("Field '%s' does not exist in '%s'" \
+                               % (key, self.name()))
+        if isinstance(value, Record):
+            return value.__node.value(value)
+        return value
+
+    def __len__(self):
+        '''
+        Returns the number of direct children of this record.
+        '''
+        return len(self.__values)
+
+    def __eq__(self, other):
+        # Nodes hold struct.Struct objects, which are only equal to
+        # themselves, so nodes are compared by their description.
+        return isinstance(other, Record) \
+            and self.__values == other.__values \
+            and (self.__node is other.__node
+                 or _fingerprint(self.__node) == _fingerprint(other.__node))
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self.__node.name, self.__values))
+
+    def __repr__(self):
+        return "Record(%r, %r)" % (self.__node.name, self.__values)
+
+class ValueNode(namedtuple("ValueNode", "name struct")):
+    '''
+    Schema node of a :mod:`Value`, decoded with its *struct*.
+    '''
+
+    __slots__ = ()
+
+    def decode(self, view, offset):
+        size = self.struct.size
+        check_buffer(view, offset, size)
+        return self.struct.unpack_from(view, offset)[0], offset + size
+
+    def encode(self, value, parts):
+        parts.append(self.struct.pack(value))
+
+    def _decode_source(self, compiler):
+        value = compiler.variable()
+        size = self.struct.size
+        _check_source(compiler, size)
+        compiler.line("%s = %s.unpack_from(view, offset)[0]" \
+                          % (value, compiler.constant(self.struct)))
+        compiler.line("offset += %d" % size)
+        return value
+
+    def _encode_source(self, compiler, value):
+        compiler.line("parts.append(%s.pack(%s))" \
+                          % (compiler.constant(self.struct), value))
+
+class BitFieldNode(namedtuple("BitFieldNode", "name size")):
+    '''
+    Schema node of a :mod:`BitField` of *size* bits. It is decoded by
+    its :class:`BitStructureNode`.
+    '''
+
+    __slots__ = ()
+
+class StringNode(namedtuple("StringNode", "name size")):
+    '''
+    Schema node of a :mod:`String` with a fixed *size*.
+    '''
+
+    __slots__ = ()
+
+    def decode(self, view, offset):
+        end = offset + self.size
+        check_buffer(view, offset, self.size)
+        return bytes(view[offset:end]), end
+
+    def encode(self, value, parts):
+        _check_length(value, self.size)
+        parts.append(bytes(value))
+
+    def _decode_source(self, compiler):
+        value = compiler.variable()
+        _check_source(compiler, self.size)
+        compiler.line("%s = bytes(view[offset:offset + %d])" \
+                          % (value, self.size))
+        compiler.line("offset += %d" % self.size)
+        return value
+
+    def _encode_source(self, compiler, value):
+        compiler.line("%s(%s, %d)" % (compiler.constant(_check_length),
+                                      value, self.size))
+        compiler.line("parts.append(bytes(%s))" % value)
+
+class StructureNode(namedtuple("StructureNode",
+                               "name children index segments")):
+    '''
+    Schema node of a :mod:`Container` with the nodes of its
+    *children*. Consecutive numeric values are decoded and encoded
+    with a single struct call.
+    '''
+
+    __slots__ = ()
+
+    def __new__(cls, name, children):
+        children = tuple(children)
+        index = dict([(c.name, i) for i, c in enumerate(children)])
+        return super(StructureNode, cls).__new__(cls, name, children, index,
+                                                 _segments(children))
+
+    def __getnewargs__(self):
+        return (self.name, self.children)
+
+    def position(self, name):
+        return self.index[name]
+
+    def items(self, values):
+        return zip([c.name for c in self.children], values)
+
+    def value(self, record):
+        return record
+
+    def decode(self, view, offset):
+        values = [None] * len(self.children)
+        for packer, indexes in self.segments:
+            if packer is None:
+                values[indexes], offset = \
+                    self.children[indexes].decode(view, offset)
+            else:
+                check_buffer(view, offset, packer.size)
+                for i, v in zip(indexes, packer.unpack_from(view, offset)):
+                    values[i] = v
+                offset += packer.size
+        return Record(self, tuple(values)), offset
+
+    def encode(self, record, parts):
+        values = record.values()
+        for packer, indexes in self.segments:
+            if packer is None:
+                self.children[indexes].encode(values[indexes], parts)
+            else:
+                parts.append(packer.pack(*[values[i] for i in indexes]))
+
+    def _decode_source(self, compiler):
+        values = [None] * len(self.children)
+        for packer, indexes in self.segments:
+            if packer is None:
+                values[indexes] = \
+                    self.children[indexes]._decode_source(compiler)
+            else:
+                for i in indexes:
+                    values[i] = compiler.variable()
+                _check_source(compiler, packer.size)
+                compiler.line("%s, = %s.unpack_from(view, offset)" \
+                                  % (", ".join([values[i] for i in indexes]),
+                                     compiler.constant(packer)))
+                compiler.line("offset += %d" % packer.size)
+        record = compiler.variable()
+        compiler.line("%s = %s(%s, (%s,))" \
+                          % (record, compiler.constant(Record),
+                             compiler.constant(self), ", ".join(values)))
+        return record
+
+    def _encode_source(self, compiler, value):
+        values = compiler.variable()
+        compiler.line("%s = %s.values()" % (values, value))
+        for packer, indexes in self.segments:
+            if packer is None:
+                self.children[indexes]._encode_source(
+                    compiler, "%s[%d]" % (values, indexes))
+            else:
+                compiler.line("parts.append(%s.pack(%s))" \
+                                  % (compiler.constant(packer),
+                                     ", ".join(["%s[%d]" % (values, i)
+                                                for i in indexes])))
+
+class BitStructureNode(namedtuple("BitStructureNode",
+                                  "name children index size")):
+    '''
+    Schema node of a :mod:`BitStructure` of *size* bytes with the
+    nodes of its bit fields.
+    '''
+
+    __slots__ = ()
+
+    def __new__(cls, name, children, size):
+        children = tuple(children)
+        index = dict([(c.name, i) for i, c in enumerate(children)])
+        return super(BitStructureNode, cls).__new__(cls, name, children,
+                                                    index, size)
+
+    def __getnewargs__(self):
+        return (self.name, self.children, self.size)
+
+    def position(self, name):
+        return self.index[name]
+
+    def items(self, values):
+        return zip([c.name for c in self.children], values)
+
+    def value(self, record):
+        return record
+
+    def decode(self, view, offset):
+        end = offset + self.size
+        check_buffer(view, offset, self.size)
+        bits = bytes_to_int(view[offset:end])
+        shift = self.size * 8
+        values = []
+        for child in self.children:
+            shift -= child.size
+            values.append((bits >> shift) & bit_mask(child.size))
+        return Record(self, tuple(values)), end
+
+    def encode(self, record, parts):
+        bits = 0
+        shift = self.size * 8
+        for child, value in zip(self.children, record.values()):
+            shift -= child.size
+            bits |= (value & bit_mask(child.size)) << shift
+        parts.append(int_to_bytes(bits, self.size))
+
+    def _decode_source(self, compiler):
+        bits = compiler.variable()
+        _check_source(compiler, self.size)
+        if self.size == 1:
+            compiler.line("%s = view[offset]" % bits)
+        else:
+            compiler.line("%s = int.from_bytes(view[offset:offset + %d], "
+                          "\"big\")" % (bits, self.size))
+        compiler.line("offset += %d" % self.size)
+        values = []
+        shift = self.size * 8
+        for child in self.children:
+            shift -= child.size
+            if shift > 0:
+                values.append("(%s >> %d) & %d" \
+                                  % (bits, shift, bit_mask(child.size)))
+            else:
+                values.append("%s & %d" % (bits, bit_mask(child.size)))
+        record = compiler.variable()
+        compiler.line("%s = %s(%s, (%s,))" \
+                          % (record, compiler.constant(Record),
+                             compiler.constant(self), ", ".join(values)))
+        return record
+
+    def _encode_source(self, compiler, value):
+        values = compiler.variable()
+        compiler.line("%s = %s.values()" % (values, value))
+        items = []
+        shift = self.size * 8
+        for i, child in enumerate(self.children):
+            shift -= child.size
+            items.append("((%s[%d] & %d) << %d)" \
+                             % (values, i, bit_mask(child.size), shift))
+        compiler.line("parts.append((%s).to_bytes(%d, \"big\"))" \
+                          % (" | ".join(items), self.size))
+
+class ArrayNode(namedtuple("ArrayNode", "name length element")):
+    '''
+    Schema node of an :mod:`Array` with the nodes of its *length*
+    field and of its elements.
+    '''
+
+    __slots__ = ()
+
+    def position(self, name):
+        if name == self.length.name:
+            return 0
+        index = int(name)
+        if index < 0:
+            raise IndexError(name)
+        return index + 1
+
+    def items(self, values):
+        yield self.length.name, values[0]
+        for i, value in enumerate(values[1:]):
+            yield str(i), value
+
+    def value(self, record):
+        return record
+
+    def decode(self, view, offset):
+        count, offset = self.length.decode(view, offset)
+        values = [count]
+        element = self.element
+        for i in range(count):
+            value, offset = element.decode(view, offset)
+            values.append(value)
+        return Record(self, tuple(values)), offset
+
+    def encode(self, record, parts):
+        values = record.values()
+        self.length.encode(values[0], parts)
+        for value in values[1:]:
+            self.element.encode(value, parts)
+
+    def _decode_source(self, compiler):
+        count = self.length._decode_source(compiler)
+        values = compiler.variable()
+        key = _value_key(self.element)
+        if key is not None:
+            # All the elements are unpacked with a single struct call.
+            order, item = key
+            size = self.element.struct.size
+            _check_source(compiler, "%s * %d" % (count, size))
+            compiler.line("%s = (%s,) + %s(%r + str(%s) + %r, view, offset)" \
+                              % (values, count,
+                                 compiler.constant(struct.unpack_from),
+                                 order, count, item))
+            compiler.line("offset += %s * %d" % (count, size))
+        else:
+            compiler.line("%s = [%s]" % (values, count))
+            compiler.line("for _ in range(%s):" % count)
+            compiler.indent()
+            element = self.element._decode_source(compiler)
+            compiler.line("%s.append(%s)" % (values, element))
+            compiler.dedent()
+        record = compiler.variable()
+        compiler.line("%s = %s(%s, tuple(%s))" \
+                          % (record, compiler.constant(Record),
+                             compiler.constant(self), values))
+        return record
+
+    def _encode_source(self, compiler, value):
+        values = compiler.variable()
+        compiler.line("%s = %s.values()" % (values, value))
+        self.length._encode_source(compiler, "%s[0]" % values)
+        key = _value_key(self.element)
+        if key is not None:
+            order, item = key
+            compiler.line("parts.append(%s(%r + str(len(%s) - 1) + %r, "
+                          "*%s[1:]))" % (compiler.constant(struct.pack),
+                                         order, values, item, values))
+        else:
+            element = compiler.variable()
+            compiler.line("for %s in %s[1:]:" % (element, values))
+            compiler.indent()
+            self.element._encode_source(compiler, element)
+            compiler.dedent()
+
+class DataNode(namedtuple("DataNode", "name length wordsize")):
+    '''
+    Schema node of a :mod:`Data` with the node of its *length* field
+    and its word size.
+    '''
+
+    __slots__ = ()
+
+    def position(self, name):
+        if name == self.length.name:
+            return 0
+        if name == "Data":
+            return 1
+        raise KeyError(name)
+
+    def items(self, values):
+        return zip([self.length.name, "Data"], values)
+
+    def value(self, record):
+        return record.values()[1]
+
+    def decode(self, view, offset):
+        count, offset = self.length.decode(view, offset)
+        size = count * self.wordsize
+        end = offset + size
+        check_buffer(view, offset, size)
+        return Record(self, (count, bytes(view[offset:end]))), end
+
+    def encode(self, record, parts):
+        count, data = record.values()
+        _check_length(data, count * self.wordsize)
+        self.length.encode(count, parts)
+        parts.append(bytes(data))
+
+    def _decode_source(self, compiler):
+        count = self.length._decode_source(compiler)
+        size = count
+        data = compiler.variable()
+        if self.wordsize != 1:
+            size = compiler.variable()
+            compiler.line("%s = %s * %d" % (size, count, self.wordsize))
+        _check_source(compiler, size)
+        compiler.line("%s = bytes(view[offset:offset + %s])" % (data, size))
+        compiler.line("offset += %s" % size)
+        record = compiler.variable()
+        compiler.line("%s = %s(%s, (%s, %s))" \
+                          % (record, compiler.constant(Record),
+                             compiler.constant(self), count, data))
+        return record
+
+    def _encode_source(self, compiler, value):
+        values = compiler.variable()
+        compiler.line("%s = %s.values()" % (values, value))
+        compiler.line("%s(%s[1], %s[0] * %d)" \
+                          % (compiler.constant(_check_length), values,
+                             values, self.wordsize))
+        self.length._encode_source(compiler, "%s[0]" % values)
+        compiler.line("parts.append(bytes(%s[1]))" % values)
+
+class Schema(object):
+    '''
+    A packet definition compiled once into immutable schema nodes, used
+    to decode packets into records.
+    '''
+
+    def __init__(self, field, compiled = False):
+        '''
+        Initialize the schema from the given packet definition *field*
+        (e.g. a :mod:`Structure` instance) or root schema node. The
+        field is not kept by the schema. If *compiled* is True, packets
+        are decoded and encoded with functions generated for this
+        schema. A *TypeError* exception is raised if any of the fields
+        can not be compiled.
+        '''
+        if isinstance(field, Field):
+            self.__node = field._schema()
+        else:
+            self.__node = field
+        self.__fingerprint = None
+        self.__decode = None
+        self.__encode = None
+        if compiled:
+            fingerprint = self.fingerprint()
+            functions = __SCHEMA_FUNCTIONS__.get(fingerprint)
+            if functions is None:
+                functions = (self.__node,) + _compile(self.__node)
+                __SCHEMA_FUNCTIONS__[fingerprint] = functions
+            # Share the nodes of the compiled functions, so records
+            # decoded by any of these schemas are the same.
+            self.__node, self.__decode, self.__encode = functions
+
+    def fingerprint(self):
+        '''
+        Returns a string (a SHA-1 hexadecimal digest) that identifies
+        the nodes of this schema. Schemas with the same fingerprint
+        decode and encode packets the same way.
+        '''
+        if self.__fingerprint is None:
+            # hashlib loads OpenSSL, only import it when needed.
+            import hashlib
+            description = _fingerprint(self.__node).encode("utf-8")
+            self.__fingerprint = hashlib.sha1(description).hexdigest()
+        return self.__fingerprint
+
+    def compiled(self):
+        '''
+        Returns True if this schema uses generated functions.
+        '''
+        return self.__decode is not None
+
+    def _set_functions(self, fingerprint, decode, encode):
+        '''
+        Makes this schema use the given generated *decode* and *encode*
+        functions of its nodes, with the given *fingerprint* (e.g.
+        loaded from a :mod:`SchemaCache`). If there are already
+        functions for the fingerprint, they are used instead.
+        '''
+        functions = __SCHEMA_FUNCTIONS__.setdefault(
+            fingerprint, (self.__node, decode, encode))
+        self.__fingerprint = fingerprint
+        self.__node, self.__decode, self.__encode = functions
+
+    def _functions(self):
+        '''
+        Returns a tuple with the generated decode and encode functions
+        of this schema, or None if it is not compiled.
+        '''
+        if self.__decode is None:
+            return None
+        return (self.__decode, self.__encode)
+
+    def node(self):
+        '''
+        Returns the root schema node.
+        '''
+        return self.__node
+
+    def name(self):
+        '''
+        Returns the name of the packet definition.
+        '''
+        return self.__node.name
+
+    def decode(self, buffer, offset = 0):
+        '''
+        Returns a :class:`Record` with the values decoded from the
+        given *buffer* (any object supporting the buffer protocol)
+        starting at *offset*. A *ValueError* exception is raised if the
+        buffer is too small.
+        '''
+        return self.decode_from(buffer, offset)[0]
+
+    def decode_from(self, buffer, offset = 0):
+        '''
+        Same as *decode()* but returns a tuple with the record and the
+        offset right after the decoded bytes.
+        '''
+        if self.__decode is not None:
+            return self.__decode(buffer_view(buffer), offset)
+        return self.__node.decode(buffer_view(buffer), offset)
+
+    def encode(self, record):
+        '''
+        Returns the bytes of the given *record* (decoded with this
+        schema).
+        '''
+        if self.__encode is not None:
+            return self.__encode(record)
+        parts = []
+        self.__node.encode(record, parts)
+        return b"".join(parts)
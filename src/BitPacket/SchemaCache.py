@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+#
+# @file    SchemaCache.py
+# @brief   On-disk cache of compiled schemas
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 18:02
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+__doc__ = '''
+
+    Schema cache
+    ============
+
+    On-disk cache of compiled schemas.
+
+    **API reference**: :class:`SchemaCache`
+
+    Creating a compiled :mod:`Schema` needs to create the fields of the
+    packet definition, build the schema nodes and generate and compile
+    the decode and encode functions. A :mod:`SchemaCache` saves the
+    nodes and the compiled functions of each schema in a directory, so
+    they are loaded the next time without creating any field:
+
+    >>> class MyStructure(Structure):
+    ...    def __init__(self):
+    ...        Structure.__init__(self, "mystructure")
+    ...        self.append(UInt8("id"))
+    ...        self.append(UInt16("sequence"))
+    ...
+    >>> import tempfile
+    >>> cache = SchemaCache(tempfile.mkdtemp())
+    >>> schema = cache.schema(MyStructure, key = "mystructure")
+    >>> schema.decode(b"\\x01\\x00\\x07")["sequence"]
+    7
+
+    Packet definitions are callables (usually classes) that return the
+    field of the packet. Each definition is identified by a key, by
+    default its module and name (a key must be given for definitions
+    without a unique name, such as lambdas or, like above, classes
+    defined in an interactive session), and the cached schema is
+    used as long as none of the source files whose code was run to
+    create it (the definition's module, the modules of the fields,
+    helper functions in other modules...) is modified. Saved
+    schemas are stored by their fingerprint (see
+    :func:`Schema.fingerprint`), so definitions with the same fields
+    share the same files.
+
+    Errors reading or writing the cache files are ignored, in which
+    case the schema is created from the packet definition as usual.
+    Cache files contain code that is run when they are loaded, so the
+    directory should only be writable by trusted users.
+
+'''
+
+import copyreg
+import hashlib
+import marshal
+import os
+import pickle
+import struct
+import sys
+import tempfile
+
+from BitPacket.Schema import Schema
+from BitPacket.SchemaCompiler import function_code, make_function
+
+# Version of the cache files. Must be incremented every time the
+# format of the files, the schema nodes or the generated code change,
+# so old files are not used.
+__SCHEMA_CACHE_VERSION__ = 2
+
+# Schema nodes keep struct.Struct instances, which can not be pickled
+# by default.
+__SCHEMA_CACHE_PICKLERS__ = copyreg.dispatch_table.copy()
+__SCHEMA_CACHE_PICKLERS__[struct.Struct] = \
+    lambda packer: (struct.Struct, (packer.format,))
+
+def _definition_key(definition):
+    '''
+    Returns the module and qualified name of the given packet
+    *definition*, or None if the definition can not be found by them
+    (e.g. lambdas, functions defined inside other functions or
+    functools.partial objects).
+    '''
+    module = getattr(definition, "__module__", None)
+    name = getattr(definition, "__qualname__", None)
+    if module is None or name is None or "<" in name:
+        return None
+    obj = sys.modules.get(module)
+    for part in name.split("."):
+        obj = getattr(obj, part, None)
+    if obj is not definition:
+        return None
+    return "%s.%s" % (module, name)
+
+def _file_stamp(path):
+    '''
+    Returns a tuple with the modification time and size of the file at
+    *path*, or None if it can not be read.
+    '''
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _build_schema(definition):
+    '''
+    Returns the compiled schema of the given packet *definition* and
+    the set of source files whose code has been run to create it (the
+    definition's module, the modules of the fields and of any helper
+    function called), or None if they can not be known because a
+    profiler is already running.
+    '''
+    if sys.getprofile() is not None:
+        return Schema(definition(), compiled = True), None
+    files = set()
+    def profile(frame, event, arg):
+        if event == "call":
+            files.add(frame.f_code.co_filename)
+    sys.setprofile(profile)
+    try:
+        schema = Schema(definition(), compiled = True)
+    finally:
+        sys.setprofile(None)
+    # The definition's module is not run if the definition is a class
+    # that inherits everything (e.g. its base class might change).
+    module = sys.modules.get(getattr(definition, "__module__", None))
+    files.add(getattr(module, "__file__", None))
+    # Generated and frozen code has no source file.
+    return schema, set([f for f in files if f and not f.startswith("<")])
+
+class SchemaCache(object):
+    '''
+    A directory where compiled schemas are saved and loaded from.
+    '''
+
+    def __init__(self, directory):
+        '''
+        Initialize the cache with the given *directory* (created if it
+        does not exist).
+        '''
+        self.__directory = directory
+        self.__schemas = {}
+        self.__stamps = {}
+        self.__tag = "%d-%s" % (__SCHEMA_CACHE_VERSION__,
+                                sys.implementation.cache_tag)
+
+    def directory(self):
+        '''
+        Returns the directory of this cache.
+        '''
+        return self.__directory
+
+    def schema(self, definition, key = None):
+        '''
+        Returns the compiled :mod:`Schema` of the given packet
+        *definition*, a callable that returns the packet field (e.g. a
+        :mod:`Structure` subclass). The definition is only called if
+        the schema is not found in the cache. *key* identifies the
+        definition in the cache; by default, it is the module and name
+        of the definition. A *ValueError* exception is raised if no
+        *key* is given and the definition can not be found by its
+        module and name (e.g. lambdas, functions defined inside other
+        functions or functools.partial objects), as different
+        definitions could have the same name.
+        '''
+        if key is None:
+            key = _definition_key(definition)
+            if key is None:
+                raise ValueError("A key is needed to cache packet "
+                                 "definition %r" % (definition,))
+        schema = self.__schemas.get(key)
+        if schema is None:
+            schema = self.__load(key)
+            if schema is None:
+                schema, files = _build_schema(definition)
+                if files is not None:
+                    stamp = [(f, _file_stamp(f)) for f in sorted(files)]
+                    self.__save(key, tuple(stamp), schema)
+            self.__schemas[key] = schema
+        return schema
+
+    def clear(self):
+        '''
+        Removes all the files of this cache from its directory.
+        '''
+        self.__schemas = {}
+        self.__stamps = {}
+        try:
+            names = os.listdir(self.__directory)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith(".key") or name.endswith(".schema"):
+                try:
+                    os.remove(os.path.join(self.__directory, name))
+                except OSError:
+                    pass
+
+    def __path(self, name, extension):
+        return os.path.join(self.__directory,
+                            "%s.%s.%s" % (name, self.__tag, extension))
+
+    def __key_path(self, key):
+        return self.__path(hashlib.sha1(key.encode("utf-8")).hexdigest(),
+                           "key")
+
+    def __valid_stamp(self, stamp):
+        '''
+        Returns True if none of the source files in the given *stamp*
+        has changed. Files are only checked once by each cache.
+        '''
+        for path, saved in stamp:
+            try:
+                current = self.__stamps[path]
+            except KeyError:
+                current = self.__stamps.setdefault(path, _file_stamp(path))
+            if current is None or current != saved:
+                return False
+        return True
+
+    def __load(self, key):
+        try:
+            with open(self.__key_path(key), "rb") as f:
+                saved_key, stamp, fingerprint = pickle.load(f)
+            if saved_key != key or not self.__valid_stamp(stamp):
+                return None
+            with open(self.__path(fingerprint, "schema"), "rb") as f:
+                node, decode, encode = pickle.load(f)
+            decode = make_function(marshal.loads(decode[0]), decode[1])
+            encode = make_function(marshal.loads(encode[0]), encode[1])
+        except Exception:
+            # Missing, old or broken files: create the schema again.
+            return None
+        schema = Schema(node)
+        schema._set_functions(fingerprint, decode, encode)
+        return schema
+
+    def __save(self, key, stamp, schema):
+        fingerprint = schema.fingerprint()
+        functions = []
+        for function in schema._functions():
+            code, constants = function_code(function)
+            functions.append((marshal.dumps(code), constants))
+        try:
+            os.makedirs(self.__directory, exist_ok = True)
+            self.__write(self.__path(fingerprint, "schema"),
+                         (schema.node(), functions[0], functions[1]))
+            self.__write(self.__key_path(key), (key, stamp, fingerprint))
+        except Exception:
+            pass
+
+    def __write(self, path, data):
+        # Write to a temporary file first, so other processes never
+        # read partial files.
+        fd, temporary = tempfile.mkstemp(dir = self.__directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickler = pickle.Pickler(f, pickle.HIGHEST_PROTOCOL)
+                pickler.dispatch_table = __SCHEMA_CACHE_PICKLERS__
+                pickler.dump(data)
+            os.replace(temporary, path)
+        except Exception:
+            os.remove(temporary)
+            raise
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+#
+# @file    SchemaCompiler.py
+# @brief   Source code generator for schema functions
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 17:08
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+__doc__ = '''
+
+    Schema compiler
+    ===============
+
+    Source code generator for schema functions.
+
+    **API reference**: :class:`SchemaCompiler`
+
+    A :mod:`SchemaCompiler` builds the source code of a single Python
+    function, line by line, and compiles it. Schema nodes use it to
+    generate straight-line code that decodes or encodes their values
+    (see :mod:`Schema`), so there are no method calls per field. Any
+    object needed by the generated code (structs, schema nodes,
+    functions...) is given to the function as a constant.
+
+    >>> compiler = SchemaCompiler("double", ["value"])
+    >>> compiler.line("result = value * 2")
+    >>> compiler.line("return result")
+    >>> compiler.function()(21)
+    42
+
+    Generated functions can be saved (e.g. with :mod:`marshal` and
+    :mod:`pickle`) and created again without generating and compiling
+    their source code:
+
+    >>> double = compiler.function()
+    >>> code, constants = function_code(double)
+    >>> make_function(code, constants)(4)
+    8
+
+'''
+
+import types
+
+def function_code(function):
+    '''
+    Returns a tuple with the code object of the given generated
+    *function* and a dictionary with its constants by name.
+    '''
+    constants = dict([(name, value)
+                      for name, value in function.__globals__.items()
+                      if not name.startswith("__") and value is not function])
+    return function.__code__, constants
+
+def make_function(code, constants):
+    '''
+    Returns a new function with the given *code* object and
+    dictionary of *constants* (see :func:`function_code`).
+    '''
+    return types.FunctionType(code, dict(constants), code.co_name)
+
+class SchemaCompiler(object):
+    '''
+    A generator of the source code of a Python function.
+    '''
+
+    def __init__(self, name, arguments):
+        '''
+        Initialize the compiler for a function with the given *name*
+        and list of *arguments* names.
+        '''
+        self.__name = name
+        self.__arguments = arguments
+        self.__lines = []
+        self.__level = 1
+        self.__variables = 0
+        self.__constants = {}
+        self.__constant_names = {}
+
+    def variable(self):
+        '''
+        Returns the name of a new local variable.
+        '''
+        self.__variables += 1
+        return "v%d" % self.__variables
+
+    def constant(self, value):
+        '''
+        Returns the name used by the generated code to refer to the
+        given *value*. The same name is returned for the same object.
+        '''
+        name = self.__constant_names.get(id(value))
+        if name is None:
+            name = "_c%d" % len(self.__constants)
+            self.__constants[name] = value
+            self.__constant_names[id(value)] = name
+        return name
+
+    def line(self, text):
+        '''
+        Appends a new line of code with the given *text* at the current
+        indentation level.
+        '''
+        self.__lines.append("    " * self.__level + text)
+
+    def indent(self):
+        '''
+        Indents the next lines (e.g. after a for statement).
+        '''
+        self.__level += 1
+
+    def dedent(self):
+        '''
+        Removes one indentation level for the next lines.
+        '''
+        self.__level -= 1
+
+    def source(self):
+        '''
+        Returns the source code of the function.
+        '''
+        header = "def %s(%s):" % (self.__name, ", ".join(self.__arguments))
+        return "\n".join([header] + self.__lines) + "\n"
+
+    def function(self):
+        '''
+        Compiles the source code and returns the new function.
+        '''
+        namespace = dict(self.__constants)
+        code = compile(self.source(), "<schema %s>" % self.__name, "exec")
+        exec(code, namespace)
+        return namespace[self.__name]
@@ -120,12 +120,20 @@ __doc__ = '''
       (length = 16)
       (data = 0x74686973206973206120737472696E67))
 
+    Note that the string is not copied from the given data. Instead,
+    the field keeps a memoryview slice of it, so *data.value()* above
+    returns a memoryview. This keeps memory usage low when decoding big
+    buffers (e.g. a memory mapped file), but the buffer should not be
+    modified while the field is in use.
+
 '''
 
-from BitPacket.utils.stream import read_stream, write_stream
+from BitPacket.utils.compatibility import u_ord
+from BitPacket.utils.stream import check_buffer, read_stream, write_stream
 from BitPacket.utils.callable import param_call
 
 from BitPacket.Field import Field
+from BitPacket.Schema import StringNode
 
 class String(Field):
     '''
@@ -136,6 +144,8 @@ class String(Field):
     also possible to specify a fixed length string.
     '''
 
+    __slots__ = ("__data", "__length")
+
     def __init__(self, name, length):
         '''
         Initialize the string field with a *name* and a
@@ -157,7 +167,32 @@ class String(Field):
         write_stream(stream, param_call(self.__length, self.root()), self.__data)
 
     def _decode(self, stream):
+        size = len(self.__data)
         self.__data = read_stream(stream, param_call(self.__length, self.root()))
+        if len(self.__data) != size:
+            self._size_changed()
+
+    def _schema(self):
+        if callable(self.__length):
+            raise TypeError("Field '%s' does not have a fixed length" \
+                                % self.name())
+        return StringNode(self.name(), self.__length)
+
+    def _static_size(self):
+        if callable(self.__length):
+            return None
+        return self.__length
+
+    def _peek(self, view, offset, layout):
+        check_buffer(view, offset, layout.size)
+        return view[offset:offset + layout.size]
+
+    def _patch(self, view, offset, layout, value):
+        if len(value) != layout.size:
+            raise ValueError("Data length must be %d (%d given)" \
+                                 % (layout.size, len(value)))
+        check_buffer(view, offset, layout.size)
+        view[offset:offset + layout.size] = value
 
     def size(self):
         '''
@@ -167,7 +202,9 @@ class String(Field):
 
     def value(self):
         '''
-        Returns the string of characters.
+        Returns the string of characters. If the field has been decoded
+        from a buffer (see :func:`Field.set_buffer`) this is a
+        memoryview slice of that buffer (use *bytes()* to get a copy).
         '''
         return self.__data
 
@@ -177,7 +214,10 @@ class String(Field):
         '''
         length = param_call(self.__length, self.root())
         if len(data) == length:
+            size = len(self.__data)
             self.__data = data
+            if length != size:
+                self._size_changed()
         else:
             raise ValueError("Data length must be %d (%d given)" \
                                  % (length, len(data)))
@@ -191,7 +231,7 @@ class String(Field):
         string = ""
         value = self.value()
         if len(value) > 0:
-            string = "0x" + "".join(["%02X" % ord(c) for c in value])
+            string = "0x" + "".join(["%02X" % u_ord(c) for c in value])
         return string
 
     def str_hex_value(self):
@@ -216,6 +256,8 @@ class Text(String):
     the string.
     '''
 
+    __slots__ = ()
+
     def __init__(self, name, length):
         String.__init__(self, name, length)
 
@@ -223,7 +265,12 @@ class Text(String):
         '''
         Returns the text string.
         '''
-        return self.value()
+        value = self.value()
+        if isinstance(value, memoryview):
+            value = value.tobytes()
+        if isinstance(value, bytes):
+            value = value.decode("utf-8", "replace")
+        return value
 
     def str_hex_value(self):
         '''
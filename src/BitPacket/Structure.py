@@ -113,7 +113,7 @@ __doc__ = '''
 
     into our previously defined structure:
 
-    >>> bs.set_bytes(data.tostring())
+    >>> bs.set_bytes(data.tobytes())
     >>> print bs
     (mypacket =
       (id = 56)
@@ -152,9 +152,94 @@ __doc__ = '''
     >>> print "0x%X" % ms.address()
     0x50607080
 
+
+    Compiled structures
+    -------------------
+
+    Numeric fields (:mod:`Integer` and :mod:`Real` types) have a fixed
+    size and are encoded with Python's struct module. Before packing
+    or unpacking, a :mod:`Structure` compiles each run of consecutive
+    numeric fields with the same byte order into a single struct
+    format, so the whole run is packed or unpacked with one call. For
+    example, the *mystructure* above is packed with a single ">BI"
+    format. Other fields (strings, arrays, sub-structures...) are still
+    encoded and decoded one by one.
+
+    Compilation is done the first time the structure is packed or
+    unpacked and is done again only if fields are appended or the
+    structure is reset.
+
+
+    Decoding many packets
+    ---------------------
+
+    To decode a big number of packets with the same layout, a single
+    :mod:`Structure` can be used to decode all of them into compact
+    records. A record is a tuple with the values of the fields, in the
+    same order as :func:`Container.keys`:
+
+    >>> bs.keys()
+    ['id', 'address']
+    >>> bs.decode_many([b"\\x01\\x00\\x00\\x00\\x02", b"\\x03\\x00\\x00\\x00\\x04"])
+    [(1, 2), (3, 4)]
+
+    Packets can also be decoded from a stream with
+    :func:`Structure.decode_iter`. If all the fields of the structure
+    (and its sub-structures) are numeric fields with the same byte
+    order, each record is unpacked with a single struct call and no
+    fields are touched at all. Otherwise, each packet is decoded into
+    the structure itself and a record is built from it.
+
+    Lazy decoding
+    -------------
+
+    When only a few fields of a big structure are needed, the structure
+    can be unpacked lazily. In this mode, the given bytes are kept by
+    the structure and a field is only decoded the first time it is
+    accessed, with :func:`Container.field`, the [] operator or
+    :func:`Container.fields`:
+
+    >>> bs.set_bytes(data.tobytes(), lazy = True)
+    >>> bs["address"]
+    2268340544
+
+    Above, only the *address* field has been decoded, as its offset is
+    known from the size of the *id* field. Fields that do not have a
+    fixed size (for example, strings whose length is given by another
+    field, arrays or meta fields) are skipped when the offset of a
+    field after them is needed: only their length fields are read
+    (meta fields and strings whose length is given by a function are
+    decoded, though).
+
+    Note that, in this mode, errors in the given data might not be
+    detected until the erroneous field is accessed. Also, field
+    references obtained before calling *set_bytes()* are not updated
+    until the fields are accessed again through the structure.
+
 '''
 
+import struct
+
+from BitPacket.utils.packing import merge_runs, run_key
+from BitPacket.utils.stream import BufferReader, IncompleteDataError, \
+    StreamCounter, buffer_view, check_buffer, read_stream, write_stream
+
 from BitPacket.Container import Container
+from BitPacket.Field import Field, _custom_codec
+
+# Maximum number of packets read at once by Structure.decode_iter().
+__DECODE_ITER_PACKETS__ = 1024
+
+def _leaf_values(container, values):
+    for f in container.fields():
+        if isinstance(f, Container):
+            _leaf_values(f, values)
+        else:
+            value = f.value()
+            # Records must not keep views of the decoded buffers.
+            if isinstance(value, memoryview):
+                value = value.tobytes()
+            values.append(value)
 
 class Structure(Container):
 
@@ -163,17 +248,407 @@ class Structure(Container):
     implementation. All the fields added to it should be byte-aligned.
     '''
 
+    __slots__ = ("__codec", "__lazy_stream", "__lazy_offsets",
+                 "__lazy_pending")
+
     def __init__(self, name):
         '''
         Initialize the structure with the given *name*. By default, it
         does not contain any fields.
         '''
         Container.__init__(self, name)
+        self.__codec = None
+
+        # Lazy decoding state: the source stream, the offsets of the
+        # first fields (as far as they are known) and the fields that
+        # still need to be decoded.
+        self.__lazy_stream = None
+        self.__lazy_offsets = None
+        self.__lazy_pending = None
+
+    def append(self, field):
+        '''
+        Appends a new *field* into the :mod:`Structure`. See
+        :func:`Container.append`.
+        '''
+        self.__settle_all()
+        Container.append(self, field)
+        self.__codec = None
+
+    def _extend(self, fields):
+        self.__settle_all()
+        Container._extend(self, fields)
+        self.__codec = None
+
+    def _truncate(self, count):
+        self.__settle_all()
+        Container._truncate(self, count)
+        self.__codec = None
+
+    def reset(self):
+        '''
+        Remove all the fields from this :mod:`Structure`.
+        '''
+        Container.reset(self)
+        self.__codec = None
+        self.__lazy_stream = None
+
+    def fields(self):
+        '''
+        Returns the (ordered) list of fields of this :mod:`Structure`.
+        If the structure has been lazily decoded, all the pending fields
+        are decoded first.
+        '''
+        self.__settle_all()
+        return Container.fields(self)
+
+    def size(self):
+        '''
+        Returns the size of the field in bytes. That is, the sum of all
+        byte sizes of the fields in this :mod:`Structure`.
+        '''
+        if self.__lazy_stream is not None:
+            self.__settle_offset(len(self.__lazy_pending))
+            return self.__lazy_offsets[-1] - self.__lazy_offsets[0]
+        return Container.size(self)
+
+    def set_bytes(self, bytes, lazy = False):
+        '''
+        Sets a string of bytes to the structure. If *lazy* is True, the
+        bytes are kept by the structure and each field is only decoded
+        the first time it is accessed.
+        '''
+        self.set_buffer(bytes, 0, lazy)
+
+    def set_buffer(self, buffer, offset = 0, lazy = False):
+        '''
+        Sets the structure with the contents of the given *buffer*,
+        starting at *offset*. See :func:`Field.set_buffer`. If *lazy* is
+        True, each field is only decoded the first time it is accessed.
+        '''
+        if not lazy:
+            return Container.set_buffer(self, buffer, offset)
+        stream = BufferReader(buffer, offset)
+        self._decode_lazy(stream)
+        # The fields that do not have a fixed size are skipped to get
+        # the size of the structure, so no field is decoded yet.
+        size = self.size()
+        stream.seek(offset)
+        available = len(stream.read(size))
+        if available != size:
+            raise IncompleteDataError(size, available)
+        return offset + size
+
+    def decode_many(self, buffers):
+        '''
+        Decodes each of the given *buffers* (any objects supporting the
+        buffer protocol) with the layout of this structure and returns
+        a list of records. A record is a tuple with the values of all
+        the fields, in the same order as :func:`Container.keys`. Records
+        do not reference the given buffers, so they can be reused or
+        modified afterwards. The structure is used as a template and its
+        field values are undefined after this call.
+        '''
+        unpacker = self._flat_struct()
+        if unpacker is not None:
+            size = unpacker.size
+            records = []
+            for buffer in buffers:
+                view = buffer_view(buffer)
+                if len(view) < size:
+                    raise IncompleteDataError(size, len(view))
+                records.append(unpacker.unpack_from(view))
+            return records
+        else:
+            records = []
+            for buffer in buffers:
+                self.set_buffer(buffer)
+                records.append(self._record())
+            return records
+
+    def decode_iter(self, stream, count = None):
+        '''
+        Returns a generator that decodes *count* consecutive packets
+        with the layout of this structure from the given byte
+        *stream*. If *count* is None, packets are decoded until the end
+        of the stream is reached. Each packet is returned as a record
+        (see :func:`Structure.decode_many`). A *ValueError* exception is
+        raised if the stream ends in the middle of a packet.
+        '''
+        unpacker = self._flat_struct()
+        if unpacker is not None:
+            return self.__decode_iter_flat(unpacker, stream, count)
+        else:
+            return self.__decode_iter(stream, count)
+
+    def __decode_iter_flat(self, unpacker, stream, count):
+        size = unpacker.size
+        data = b""
+        while count is None or count > 0:
+            # Read as many whole packets as possible at once.
+            packets = __DECODE_ITER_PACKETS__
+            if count is not None:
+                packets = min(packets, count)
+            chunk = stream.read(packets * size - len(data))
+            if not chunk:
+                # Stop only if no packets are missing.
+                if data or count is not None:
+                    raise IncompleteDataError(size, len(data))
+                return
+            data += chunk
+            end = len(data) - len(data) % size
+            for record in unpacker.iter_unpack(data[:end]):
+                yield record
+            if count is not None:
+                count -= end // size
+            data = data[end:]
+
+    def __decode_iter(self, stream, count):
+        counter = StreamCounter(stream)
+        while count is None or count > 0:
+            start = counter.count()
+            try:
+                self._decode(counter)
+            except IncompleteDataError:
+                # Stop if the stream was already exhausted.
+                if count is None and counter.count() == start:
+                    return
+                raise
+            yield self._record()
+            if count is not None:
+                count -= 1
+
+    def _flat_struct(self):
+        '''
+        Returns a struct.Struct that unpacks all the fields of this
+        structure (recursively) in a single call, or None if the
+        structure can not be unpacked that way.
+        '''
+        key = self._flat_format()
+        if key is None:
+            return None
+        return struct.Struct(key[0] + key[1])
+
+    def _flat_format(self):
+        '''
+        Returns a tuple with the byte order and the format items of all
+        the fields of this structure (recursively), or None if the
+        fields are not numeric fields with the same byte order.
+        '''
+        order = None
+        items = []
+        for f in Container.fields(self):
+            field_type = type(f)
+            if issubclass(field_type, Structure) \
+                    and field_type._decode is Structure._decode:
+                key = f._flat_format()
+            else:
+                format = f._struct_format()
+                key = run_key(format) if format else None
+            if key is None or (order is not None and key[0] != order):
+                return None
+            order = key[0]
+            items.append(key[1])
+        if order is None:
+            return None
+        return (order, "".join(items))
+
+    def _record(self):
+        '''
+        Returns a tuple with the values of all the fields, in the same
+        order as :func:`Container.keys`.
+        '''
+        values = []
+        _leaf_values(self, values)
+        return tuple(values)
+
+    def _schema(self):
+        # Schemas only know how plain structures are encoded and
+        # decoded.
+        if _custom_codec(self, Structure):
+            return Field._schema(self)
+        return Container._schema(self)
+
+    def _static_size(self):
+        size = 0
+        for f in Container.fields(self):
+            field_size = f._static_size()
+            if field_size is None:
+                return None
+            size += field_size
+        return size
+
+    def _skip(self, stream):
+        # Structures with their own decoding are decoded.
+        if type(self)._decode is not Structure._decode:
+            Field._skip(self, stream)
+            return
+        size = self._static_size()
+        if size is None:
+            for f in Container.fields(self):
+                f._skip(stream)
+        else:
+            read_stream(stream, size)
+
+    def _child(self, name):
+        field = Container._child(self, name)
+        if self.__lazy_stream is not None:
+            self.__settle(Container.fields(self).index(field))
+        return field
+
+    def _lazy(self):
+        return self.__lazy_stream is not None
+
+    def _child_at(self, index):
+        if self.__lazy_stream is not None:
+            self.__settle(index)
+        return Container._child_at(self, index)
+
+    def _decode_lazy(self, stream):
+        # Structures with their own decoding are decoded right away.
+        if type(self)._decode is not Structure._decode:
+            self._decode(stream)
+            return
+        self.__lazy_stream = stream
+        self.__lazy_offsets = [stream.tell()]
+        self.__lazy_pending = [True] * len(Container.fields(self))
+        # The size and the keys of the fields are not known until the
+        # fields are decoded.
+        self._fields_changed()
+
+    def __settle_offset(self, index):
+        '''
+        Makes sure that the offset of the field at *index* is known,
+        decoding the fields before it that do not have a fixed size.
+        '''
+        fields = Container.fields(self)
+        offsets = self.__lazy_offsets
+        while len(offsets) <= index:
+            i = len(offsets) - 1
+            size = fields[i]._static_size()
+            if size is None:
+                size = self.__skip(i)
+            offsets.append(offsets[i] + size)
+
+    def __skip(self, index):
+        '''
+        Returns the size of the field at *index*, skipping its bytes if
+        it is still pending so it does not need to be decoded.
+        '''
+        field = Container.fields(self)[index]
+        if not self.__lazy_pending[index]:
+            return field.size()
+        stream = self.__lazy_stream
+        position = stream.tell()
+        stream.seek(self.__lazy_offsets[index])
+        try:
+            field._skip(stream)
+            return stream.tell() - self.__lazy_offsets[index]
+        finally:
+            stream.seek(position)
+
+    def __settle(self, index):
+        '''
+        Decodes the field at *index* if it is still pending.
+        '''
+        if self.__lazy_pending[index]:
+            self.__settle_offset(index)
+            self.__lazy_pending[index] = False
+            stream = self.__lazy_stream
+            # The field might lazily decode other fields (e.g. a
+            # length), so restore the stream position afterwards.
+            position = stream.tell()
+            stream.seek(self.__lazy_offsets[index])
+            try:
+                Container.fields(self)[index]._decode_lazy(stream)
+            except:
+                self.__lazy_pending[index] = True
+                raise
+            finally:
+                stream.seek(position)
+
+    def __settle_all(self):
+        if self.__lazy_stream is not None:
+            for i in range(len(self.__lazy_pending)):
+                self.__settle(i)
+            self.__end_lazy()
+
+    def __end_lazy(self):
+        '''
+        Leaves the lazy decoding state, if needed, discarding the
+        pending fields.
+        '''
+        if self.__lazy_stream is not None:
+            self.__lazy_stream = None
+            self.__lazy_offsets = None
+            self.__lazy_pending = None
+            self._fields_changed()
+
+    def _codec(self):
+        '''
+        Returns the compiled list of segments of this structure. A
+        segment is a tuple with a struct.Struct and the list of fields
+        packed by it, or a tuple with None and a list with a single
+        field that needs to be encoded and decoded by itself.
+        '''
+        if self.__codec is None:
+            self.__codec = merge_runs([(f._struct_format(), f)
+                                       for f in Container.fields(self)])
+        return self.__codec
 
     def _encode(self, stream):
-        for f in self.fields():
-            f._encode(stream)
+        self.__settle_all()
+        for packer, fields in self._codec():
+            if packer is None:
+                fields[0]._encode(stream)
+            else:
+                values = [f.value() for f in fields]
+                write_stream(stream, packer.size, packer.pack(*values))
+
+    def _encode_into(self, view, offset):
+        # Structures with their own encoding are encoded with it.
+        if type(self)._encode is not Structure._encode:
+            return Field._encode_into(self, view, offset)
+        self.__settle_all()
+        for packer, fields in self._codec():
+            if packer is None:
+                offset = fields[0]._encode_into(view, offset)
+            else:
+                check_buffer(view, offset, packer.size)
+                packer.pack_into(view, offset, *[f.value() for f in fields])
+                offset += packer.size
+        return offset
+
+    def _decode_resumable(self, stream):
+        # Structures with their own decoding are decoded again after
+        # each resume.
+        if type(self)._decode is not Structure._decode:
+            for missing in Field._decode_resumable(self, stream):
+                yield missing
+            return
+        self.__end_lazy()
+        for packer, fields in self._codec():
+            if packer is None:
+                for missing in fields[0]._decode_resumable(stream):
+                    yield missing
+            else:
+                position = stream.tell()
+                while True:
+                    try:
+                        data = read_stream(stream, packer.size)
+                        break
+                    except IncompleteDataError as err:
+                        stream.seek(position)
+                        yield err.missing
+                for f, v in zip(fields, packer.unpack(data)):
+                    f._set_decoded(v)
 
     def _decode(self, stream):
-        for f in self.fields():
-            f._decode(stream)
+        self.__end_lazy()
+        for packer, fields in self._codec():
+            if packer is None:
+                fields[0]._decode(stream)
+            else:
+                data = read_stream(stream, packer.size)
+                for f, v in zip(fields, packer.unpack(data)):
+                    f._set_decoded(v)
@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+#
+# @file    Template.py
+# @brief   Pre-encoded packets with a few variable fields
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 13:12
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+__doc__ = '''
+
+    Templates
+    =========
+
+    Pre-encoded packets with a few variable fields.
+
+    **API reference**: :class:`Template`
+
+    Sometimes lots of packets need to be created that only differ in a
+    few fields (e.g. a sequence number, a timestamp or a payload). A
+    :mod:`Template` encodes a fully populated packet only once and
+    creates new packets by copying its bytes and only encoding the
+    fields declared as variable.
+
+    >>> packet = Structure("command")
+    >>> packet.append(UInt8("id", 0x42))
+    >>> packet.append(UInt16BE("sequence"))
+    >>> packet.append(Data("payload", UInt8("length")))
+    >>> packet["payload"] = b"abc"
+
+    >>> template = Template(packet, ["sequence", "payload"])
+    >>> template.build({"sequence": 7})
+    bytearray(b'B\\x00\\x07\\x03abc')
+
+    Fixed size fields (numeric fields, bit fields and strings of a
+    fixed length) are written directly into the copied bytes. Fields
+    with a variable size, such as :mod:`Data`, or with their own way of
+    encoding are encoded again and placed between the constant bytes:
+
+    >>> template.build({"sequence": 8, "payload": b"hello"})
+    bytearray(b'B\\x00\\x08\\x05hello')
+
+    Note that only the variable fields change, so any other field
+    depending on them (e.g. a total length or a checksum) must also be
+    declared as variable and given a value.
+
+'''
+
+from BitPacket.utils.stream import buffer_view, check_buffer
+
+from BitPacket.Container import Container, FIELD_SEPARATOR
+from BitPacket.Field import FieldLayout
+
+def _frozen_layout(field, key, offset, layouts):
+    '''
+    Appends the layout of *field* (and its sub-fields), identified by
+    *key* and placed at *offset* bytes, to the *layouts* dictionary
+    using its current size and returns the offset right after the
+    field. Unlike *_layout()*, this also works for fields with a
+    variable size, but the layout is only valid for the current field
+    values.
+    '''
+    start = offset
+    if field._static_size() is not None:
+        leaves = []
+        offset = field._layout(key, offset, leaves)
+        for layout in leaves:
+            layouts[layout.key] = layout
+    elif isinstance(field, Container):
+        for f in field.fields():
+            offset = _frozen_layout(f, key + FIELD_SEPARATOR + f.name(),
+                                    offset, layouts)
+    else:
+        offset += field.size()
+    if key not in layouts:
+        layouts[key] = FieldLayout(key, start, offset - start, None, None)
+    return offset
+
+def _patchable(field, layout, data):
+    '''
+    Returns True if the given fixed size *field*, placed at *layout*,
+    can be written directly into a copy of the template bytes *data*
+    (i.e. it does not have its own way of encoding its value).
+    '''
+    try:
+        field._patch(buffer_view(bytearray(data)), layout.offset, layout,
+                     field.value())
+    except TypeError:
+        return False
+    return True
+
+class Template(object):
+    '''
+    A packet encoded only once that is used to create new packets by
+    changing a few variable fields.
+    '''
+
+    def __init__(self, packet, keys):
+        '''
+        Initialize the template with the bytes of the given *packet*
+        (a fully populated :mod:`Container`) and the list of *keys* of
+        the fields that will change in each new packet. The *packet*
+        is kept to encode the fields with a variable size or with their
+        own way of encoding (e.g. overriding *set_value()*), so their
+        values will change after building new packets. A *KeyError*
+        exception is raised if a key does not exist, a *ValueError*
+        exception if a variable field is inside another variable field
+        with a variable size and a *TypeError* exception if a variable
+        bit field has its own way of encoding.
+        '''
+        data = packet.bytes()
+
+        layouts = {}
+        offset = 0
+        for f in packet.fields():
+            offset = _frozen_layout(f, f.name(), offset, layouts)
+
+        patches = []
+        splices = []
+        for key in keys:
+            field = packet.field(key)
+            layout = layouts[key]
+            if layout.bit_size is None and field._static_size() is None:
+                splices.append((layout, field))
+            elif _patchable(field, layout, data):
+                patches.append((layout, field))
+            elif layout.bit_size is None:
+                # Fields with their own encoding are encoded again.
+                splices.append((layout, field))
+            else:
+                raise TypeError("Bit field '%s' can not be encoded into "
+                                "a template" % key)
+
+        splices.sort(key = lambda splice: splice[0].offset)
+        for layout, field in splices:
+            for other in keys:
+                if other != layout.key and \
+                        other.startswith(layout.key + FIELD_SEPARATOR):
+                    raise ValueError("Field '%s' is inside variable field "
+                                     "'%s'" % (other, layout.key))
+
+        # Constant bytes are split in chunks around variable size
+        # fields, fixed size fields are patched relative to the chunk
+        # where they belong.
+        self.__chunks = []
+        self.__splices = []
+        start = 0
+        for layout, field in splices:
+            end = layout.offset + layout.size
+            self.__chunks.append(data[start:layout.offset])
+            self.__splices.append((layout.key, field,
+                                   data[layout.offset:end]))
+            start = end
+        self.__chunks.append(data[start:])
+
+        self.__patches = {}
+        for layout, field in patches:
+            index = 0
+            start = 0
+            for splice_layout, splice_field in splices:
+                if layout.offset < splice_layout.offset:
+                    break
+                index += 1
+                start = splice_layout.offset + splice_layout.size
+            self.__patches[layout.key] = (index, field,
+                                          layout.offset - start, layout)
+
+        self.__keys = list(keys)
+        self.__size = len(data)
+
+    def keys(self):
+        '''
+        Returns the list of keys of the variable fields.
+        '''
+        return self.__keys
+
+    def size(self):
+        '''
+        Returns the size in bytes of the template (i.e. the size of the
+        packet given when the template was created).
+        '''
+        return self.__size
+
+    def build(self, values = None):
+        '''
+        Returns a new bytearray with the bytes of the template where
+        the variable fields have been set to the given *values*, a
+        dictionary with the keys of the variable fields. Variable fields
+        not in *values* keep the value they had in the template. A
+        *KeyError* exception is raised if a key is not a variable field.
+        '''
+        values = values or {}
+        if not self.__splices:
+            data = bytearray(self.__chunks[0])
+            self.__patch(buffer_view(data), [0], values)
+            return data
+
+        size, items = self.__prepare(values)
+        data = bytearray(size)
+        self.__write(buffer_view(data), 0, items, values)
+        return data
+
+    def build_into(self, buffer, values = None, offset = 0):
+        '''
+        Writes the bytes of the template where the variable fields have
+        been set to the given *values* (see *build()*) into the given
+        writable *buffer* (bytearray, memoryview, mmap...) starting at
+        *offset*. Returns the offset right after the written bytes. A
+        *ValueError* exception is raised if the packet does not fit in
+        the buffer.
+        '''
+        values = values or {}
+        view = buffer_view(buffer)
+        size, items = self.__prepare(values)
+        check_buffer(view, offset, size)
+        return self.__write(view, offset, items, values)
+
+    def __prepare(self, values):
+        '''
+        Sets the given *values* to the variable size fields and returns
+        the total size of the new packet and, for each variable size
+        field, the field itself or the template bytes if it keeps its
+        template value.
+        '''
+        for key in values:
+            if key not in self.__patches:
+                self.__check_key(key)
+
+        size = self.__size
+        items = []
+        for key, field, data in self.__splices:
+            if key in values:
+                field.set_value(values[key])
+                size += field.size() - len(data)
+                items.append(field)
+            else:
+                items.append(data)
+        return size, items
+
+    def __write(self, view, offset, items, values):
+        '''
+        Writes the constant chunks and the given *items* (see
+        *__prepare()*) into *view* at *offset*, patches the fixed size
+        fields and returns the offset after the new packet.
+        '''
+        starts = []
+        for chunk, item in zip(self.__chunks, items + [None]):
+            starts.append(offset)
+            end = offset + len(chunk)
+            view[offset:end] = chunk
+            offset = end
+            if isinstance(item, bytes):
+                end = offset + len(item)
+                view[offset:end] = item
+                offset = end
+            elif item is not None:
+                offset = item._encode_into(view, offset)
+        self.__patch(view, starts, values)
+        return offset
+
+    def __patch(self, view, starts, values):
+        '''
+        Writes the given *values* of fixed size fields into *view*,
+        where *starts* are the offsets of the constant chunks.
+        '''
+        patches = self.__patches
+        for key, value in values.items():
+            try:
+                index, field, offset, layout = patches[key]
+            except KeyError:
+                self.__check_key(key)
+                continue
+            field._patch(view, starts[index] + offset, layout, value)
+
+    def __check_key(self, key):
+        '''
+        Raises a *KeyError* exception if *key* is not a variable field.
+        '''
+        for splice in self.__splices:
+            if splice[0] == key:
+                return
+        raise KeyError("Field '%s' is not a variable field of the template" \
+                           % key)
@@ -50,9 +50,10 @@ import struct
 from BitPacket.utils.compatibility import *
 
 from BitPacket.utils.string import hex_string
-from BitPacket.utils.stream import read_stream, write_stream
+from BitPacket.utils.stream import check_buffer, read_stream, write_stream
 
 from BitPacket.Field import Field
+from BitPacket.Schema import ValueNode
 
 # Character     Byte order               Size and alignment
 # @             native                   native
@@ -61,6 +62,42 @@ from BitPacket.Field import Field
 # >             big-endian               standard
 # !             network (= big-endian)   standard
 
+# Compiled struct formats, shared by all the values with the same
+# format.
+__VALUE_STRUCTS__ = {}
+
+def _value_struct(format):
+    '''
+    Returns the shared struct.Struct compiled for the given *format*.
+    '''
+    try:
+        return __VALUE_STRUCTS__[format]
+    except KeyError:
+        return __VALUE_STRUCTS__.setdefault(format, struct.Struct(format))
+
+# Methods that change how the value of a field is encoded or decoded if
+# they are overridden.
+__VALUE_CODEC_METHODS__ = ("value", "set_value", "_encode", "_decode",
+                           "_encode_into", "_set_decoded")
+
+# Whether each Value subclass encodes and decodes its value as Value
+# does.
+__VALUE_PLAIN_TYPES__ = {}
+
+def _plain_value_type(value_type):
+    '''
+    Returns True if the given Value subclass *value_type* does not
+    override the way values are encoded or decoded.
+    '''
+    try:
+        return __VALUE_PLAIN_TYPES__[value_type]
+    except KeyError:
+        plain = True
+        for name in __VALUE_CODEC_METHODS__:
+            if getattr(value_type, name) is not getattr(Value, name):
+                plain = False
+        return __VALUE_PLAIN_TYPES__.setdefault(value_type, plain)
+
 class Value(Field):
 
     '''
@@ -69,6 +106,8 @@ class Value(Field):
     order (little-endian or big-endian).
     '''
 
+    __slots__ = ("__value", "__bytes", "__struct")
+
     def __init__(self, name, format, value):
         '''
         Initialize the field with the given *name* and *value*. The
@@ -77,36 +116,100 @@ class Value(Field):
         '''
         Field.__init__(self, name)
 
-        # This will store the string of bytes
-        self.__bytes = ""
+        # This will store the numeric value and, once needed, its
+        # packed bytes
+        self.__value = None
+        self.__bytes = None
 
-        # Calculate byte size from struct type
-        self.__format = format
-        self.__size = struct.calcsize(self.__format)
+        # The shared struct also gives us the format and byte size
+        self.__struct = _value_struct(format)
 
         # Finally set default value
         self.set_value(value)
 
     def _encode(self, stream):
-        write_stream(stream, self.size(), self.__bytes)
+        write_stream(stream, self.__struct.size, self.__packed())
 
     def _decode(self, stream):
-        self.__bytes = read_stream(stream, self.size())
+        data = read_stream(stream, self.__struct.size)
+        self.__value = self.__struct.unpack(data)[0]
+        self.__bytes = None
+
+    def _encode_into(self, view, offset):
+        # Subclasses with their own encoding are encoded with it.
+        if type(self)._encode is not Value._encode:
+            return Field._encode_into(self, view, offset)
+        check_buffer(view, offset, self.__struct.size)
+        self.__struct.pack_into(view, offset, self.__value)
+        return offset + self.__struct.size
+
+    def _peek(self, view, offset, layout):
+        # Only plain values can be decoded without the field.
+        if not _plain_value_type(type(self)):
+            return Field._peek(self, view, offset, layout)
+        check_buffer(view, offset, self.__struct.size)
+        return self.__struct.unpack_from(view, offset)[0]
+
+    def _patch(self, view, offset, layout, value):
+        # Only plain values can be encoded without the field.
+        if not _plain_value_type(type(self)):
+            return Field._patch(self, view, offset, layout, value)
+        # The value is packed first so the buffer is left untouched if
+        # it does not fit in the field.
+        data = self.__struct.pack(value)
+        check_buffer(view, offset, len(data))
+        view[offset:offset + len(data)] = data
+
+    def __packed(self):
+        '''
+        Returns the packed bytes of the current value. They are only
+        packed the first time they are needed after the value changes.
+        '''
+        if self.__bytes is None:
+            self.__bytes = self.__struct.pack(self.__value)
+        return self.__bytes
+
+    def _set_decoded(self, value):
+        '''
+        Sets an already unpacked *value* to this field. This is used by
+        containers that decode multiple fields with a single struct
+        call, so *value* is assumed to be valid for this field.
+        '''
+        self.__value = value
+        self.__bytes = None
+
+    def _schema(self):
+        # Schemas only know how plain values are encoded and decoded.
+        if not _plain_value_type(type(self)):
+            return Field._schema(self)
+        return ValueNode(self.name(), self.__struct)
+
+    def _static_size(self):
+        return self.__struct.size
+
+    def _struct_format(self):
+        # Subclasses with their own encoding can not be packed together
+        # with other fields.
+        if not _plain_value_type(type(self)):
+            return None
+        return self.__struct.format
 
     def value(self):
         '''
         Returns the numeric value of this field.
         '''
-        value = struct.unpack(self.__format, self.__bytes)
-        return value[0]
+        return self.__value
 
     def set_value(self, value):
         '''
         Sets the new numeric *value* to this field. The value must fit
         in this field, otherwise an exception is raised.
         '''
-        bytes = struct.pack(self.__format, value)
-        self.set_bytes(bytes)
+        # Packing checks that the value fits and unpacking gives us
+        # the value as it is really stored (e.g. float precision).
+        bytes = self.__struct.pack(value)
+        self.__value = self.__struct.unpack(bytes)[0]
+        self.__bytes = bytes
 
     def hex_value(self):
         '''
@@ -117,7 +220,7 @@ class Value(Field):
         hexadecimal value than :class:`UInt16BE` for the same number.
         '''
         value = 0
-        for c in self.__bytes:
+        for c in self.__packed():
             value = (value << 8) + u_ord(c)
         return value
 
@@ -125,7 +228,7 @@ class Value(Field):
         '''
         Returns the size in bytes of this field.
         '''
-        return self.__size
+        return self.__struct.size
 
     def str_value(self):
         '''
@@ -22,24 +22,49 @@
 # along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
 #
 
-from BitPacket.Array import Array
-from BitPacket.BitField import BitField
-from BitPacket.BitStructure import BitStructure
-from BitPacket.Boolean import Boolean
-from BitPacket.Container import Container
-from BitPacket.Data import Data
-from BitPacket.Field import Field
-from BitPacket.Flag import Flag
-from BitPacket.Integer import *
-from BitPacket.Mask import *
-from BitPacket.MetaField import MetaField
-from BitPacket.Real import *
-from BitPacket.String import *
-from BitPacket.Structure import Structure
-from BitPacket.Value import Value
+# Objects are imported the first time they are used (e.g. importing
+# BitPacket does not import asyncio until PacketDatagramProtocol is
+# used).
 
+import sys
 
-__all__ = [ "Array",
+from BitPacket.utils.lazy import lazy_package
+
+lazy_package(__name__, {
+        "Accessor" : [ "Accessor" ],
+        "Array" : [ "Array" ],
+        "BitField" : [ "BitField" ],
+        "BitStructure" : [ "BitStructure" ],
+        "Boolean" : [ "Boolean" ],
+        "Container" : [ "Container" ],
+        "Data" : [ "Data" ],
+        "Field" : [ "Field" ],
+        "Flag" : [ "Flag" ],
+        "Integer" : [ "Int8", "UInt8", "Int8LE", "UInt8LE",
+                      "Int8BE", "UInt8BE",
+                      "Int16", "UInt16", "Int16LE", "UInt16LE",
+                      "Int16BE", "UInt16BE",
+                      "Int32", "UInt32", "Int32LE", "UInt32LE",
+                      "Int32BE", "UInt32BE",
+                      "Int64", "UInt64", "Int64LE", "UInt64LE",
+                      "Int64BE", "UInt64BE" ],
+        "Mask" : [ "Mask" ],
+        "MetaField" : [ "MetaField" ],
+        "NumericArray" : [ "NumericArray" ],
+        "PacketParser" : [ "PacketParser" ],
+        "PacketProtocol" : [ "PacketDatagramProtocol", "read_packet" ],
+        "PacketReader" : [ "PacketReader" ],
+        "Real" : [ "Float", "FloatLE", "FloatBE",
+                   "Double", "DoubleLE", "DoubleBE" ],
+        "Schema" : [ "Record", "Schema" ],
+        "SchemaCache" : [ "SchemaCache" ],
+        "String" : [ "String", "Text" ],
+        "Structure" : [ "Structure" ],
+        "Template" : [ "Template" ],
+        "Value" : [ "Value" ] })
+
+__all__ = [ "Accessor",
+            "Array",
             "BitField",
             "BitStructure",
             "Boolean",
@@ -53,8 +78,19 @@ __all__ = [ "Array",
             "Int64", "UInt64", "Int64LE", "UInt64LE", "Int64BE", "UInt64BE",
             "Mask",
             "MetaField",
+            "NumericArray",
+            "PacketParser",
+            "PacketReader",
+            "Record",
+            "Schema",
+            "SchemaCache",
             "Float", "FloatLE", "FloatBE",
             "Double", "DoubleLE", "DoubleBE",
             "String", "Text",
             "Structure",
+            "Template",
             "Value" ]
+
+# The asyncio integration needs Python 3.5 or later.
+if sys.version_info >= (3, 5):
+    __all__ += [ "PacketDatagramProtocol", "read_packet" ]
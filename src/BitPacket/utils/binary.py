@@ -35,49 +35,11 @@ def byte_end(bit_size):
         byte_end += 1
     return byte_end
 
-def int_to_bin(number, width = 32):
-    if number < 0:
-        number += 1 << width
-    i = width - 1
-    bits = ["\x00"] * width
-    while number and i >= 0:
-        bits[i] = "\x00\x01"[number & 1]
-        number >>= 1
-        i -= 1
-    return "".join(bits)
+def bit_mask(bit_size):
+    return (1 << bit_size) - 1
 
-_bit_values = {"\x00" : 0, "\x01" : 1, "0" : 0, "1" : 1}
-def bin_to_int(bits, signed = False):
-    number = 0
-    bias = 0
-    if signed and _bit_values[bits[0]] == 1:
-        bits = bits[1:]
-        bias = 1 << len(bits)
-    for b in bits:
-        number <<= 1
-        number |= _bit_values[b]
-    return number - bias
+def bytes_to_int(data):
+    return int.from_bytes(data, "big")
 
-_char_to_bin = {}
-_bin_to_char = {}
-for _i in range(256):
-    _ch = chr(_i)
-    _bin = int_to_bin(_i, __BYTE_SIZE__)
-    _char_to_bin[_ch] = _bin
-    _bin_to_char[_bin] = _ch
-
-def encode_bin(data):
-    return "".join(_char_to_bin[ch] for ch in data)
-
-def decode_bin(data):
-    data_size = len(data)
-    end = byte_end(data_size)
-    bit_size = end * __BYTE_SIZE__
-    bit_missing = bit_size - data_size
-    data += "\x00" * bit_missing
-    chars = ""
-    i = 0
-    while i < bit_size:
-        chars += _bin_to_char[data[i:i + __BYTE_SIZE__]]
-        i += __BYTE_SIZE__
-    return chars
+def int_to_bytes(number, byte_size):
+    return number.to_bytes(byte_size, "big")
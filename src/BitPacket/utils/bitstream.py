@@ -24,14 +24,23 @@
 # along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
 #
 
-from BitPacket.utils.binary import encode_bin, decode_bin
+from BitPacket.utils.binary import __BYTE_SIZE__, byte_end, bit_mask, \
+    bytes_to_int, int_to_bytes
+from BitPacket.utils.stream import read_stream
+
+# Bits are kept in a Python integer, the first bit read (or written)
+# being the most significant one.
 
 class BitStreamReader(object):
 
-    def __init__(self, substream):
+    def __init__(self, substream, size = 0):
         self.__substream = substream
         self.__total_size = 0
-        self.__buffer = ""
+        self.__buffer = 0
+        self.__buffer_size = 0
+        # Read ahead the given number of bytes, if any.
+        if size > 0:
+            self.__fill(size)
 
     def close(self):
         if self.__total_size % 8 != 0:
@@ -42,45 +51,49 @@ class BitStreamReader(object):
         return self.__substream.tell()
 
     def seek(self, pos, whence = 0):
-        self.__buffer = ""
+        self.__buffer = 0
+        self.__buffer_size = 0
         self.__total_size = 0
         self.__substream.seek(pos, whence)
 
     def read(self, count):
+        '''
+        Returns the next *count* bits as an unsigned integer.
+        '''
         assert count >= 0
-        l = len(self.__buffer)
-        if count == 0:
-            data = ""
-        elif count <= l:
-            data = self.__buffer[:count]
-            self.__buffer = self.__buffer[count:]
-        else:
-            data = self.__buffer
-            count -= l
-            bytes = count // 8
-            if count & 7:
-                bytes += 1
-            buf = encode_bin(self.__substream.read(bytes))
-            data += buf[:count]
-            self.__buffer = buf[count:]
-        self.__total_size += len(data)
-        return data
+        if count > self.__buffer_size:
+            self.__fill(byte_end(count - self.__buffer_size))
+        self.__buffer_size -= count
+        value = self.__buffer >> self.__buffer_size
+        self.__buffer &= bit_mask(self.__buffer_size)
+        self.__total_size += count
+        return value
+
+    def __fill(self, size):
+        data = read_stream(self.__substream, size)
+        self.__buffer = (self.__buffer << (size * __BYTE_SIZE__)) \
+            | bytes_to_int(data)
+        self.__buffer_size += size * __BYTE_SIZE__
 
 
 class BitStreamWriter(object):
 
     def __init__(self, substream):
         self.__substream = substream
-        self.__buffer = []
+        self.__buffer = 0
         self.__pos = 0
 
     def close(self):
         self.flush()
 
     def flush(self):
-        bytes = decode_bin("".join(self.__buffer))
-        self.__substream.write(bytes)
-        self.__buffer = []
+        size = byte_end(self.__pos)
+        if size > 0:
+            # Pad with zeros up to the next byte boundary.
+            padding = size * __BYTE_SIZE__ - self.__pos
+            self.__substream.write(int_to_bytes(self.__buffer << padding,
+                                                size))
+        self.__buffer = 0
         self.__pos = 0
 
     def tell(self):
@@ -90,9 +103,13 @@ class BitStreamWriter(object):
         self.flush()
         self.__substream.seek(pos, whence)
 
-    def write(self, data):
-        if not data:
-            return
-        if type(data) is not str:
-            raise TypeError("Data must be a string, not %r" % type(data))
-        self.__buffer.append(data)
+    def write(self, value, count):
+        '''
+        Writes the *count* least significant bits of the unsigned
+        integer *value*.
+        '''
+        if value < 0 or value >> count:
+            raise ValueError("Value %d does not fit in %d bits" \
+                                 % (value, count))
+        self.__buffer = (self.__buffer << count) | value
+        self.__pos += count
@@ -30,6 +30,11 @@ try:
 except NameError:
     pass
 
+try:
+    intern = sys.intern
+except AttributeError:
+    intern = intern
+
 def u_ord(c):
     if sys.hexversion >= 0x03000000:
         return c
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+#
+# @file    lazy.py
+# @brief   Packages that import their objects when first used
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 19:05
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import sys
+import types
+
+from importlib import import_module
+
+class LazyPackage(types.ModuleType):
+    '''
+    A package that imports the objects it exports from their modules
+    the first time they are used. See :func:`lazy_package`.
+    '''
+
+    def __getattr__(self, name):
+        module = self.__dict__["__lazy_objects__"].get(name)
+        if module is None:
+            raise AttributeError("module %r has no attribute %r" \
+                                     % (self.__name__, name))
+        value = getattr(import_module(self.__name__ + "." + module), name)
+        self.__dict__[name] = value
+        return value
+
+    def __setattr__(self, name, value):
+        # Importing a module of the package (e.g. BitPacket.Array)
+        # would hide the object with the same name.
+        if name in self.__dict__["__lazy_objects__"] \
+                and isinstance(value, types.ModuleType):
+            return
+        types.ModuleType.__setattr__(self, name, value)
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(self.__lazy_objects__))
+
+def lazy_package(name, modules):
+    '''
+    Makes the package with the given *name* import its objects the
+    first time they are used. *modules* is a dictionary with the list
+    of object names exported by each module of the package.
+    '''
+    package = sys.modules[name]
+    package.__dict__["__lazy_objects__"] = \
+        dict([(obj, module)
+              for module, objects in modules.items() for obj in objects])
+    try:
+        package.__class__ = LazyPackage
+    except TypeError:
+        # The class of a module can not be changed before Python 3.5,
+        # so the objects are imported right away, skipping the modules
+        # that need a newer Python.
+        for module, objects in modules.items():
+            try:
+                module = import_module(name + "." + module)
+            except SyntaxError:
+                continue
+            for obj in objects:
+                setattr(package, obj, getattr(module, obj))
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+#
+# @file    packing.py
+# @brief   Merging of struct formats in a single struct call
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 23:48
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import struct
+
+# Byte orders that can be merged in a single struct format. Native
+# byte order (@) is not included as it adds alignment padding.
+__RUN_BYTE_ORDERS__ = { "<" : "<", ">" : ">", "!" : ">", "=" : "=" }
+
+def run_key(format):
+    '''
+    Returns a tuple with the byte order and the format item of the
+    given struct *format*, or None if *format* can not be merged with
+    others (native alignment or more than one item).
+    '''
+    order = __RUN_BYTE_ORDERS__.get(format[:1])
+    if order is None:
+        return None
+    if len(struct.unpack(format, bytes(struct.calcsize(format)))) != 1:
+        return None
+    return (order, format[1:])
+
+def merge_runs(items):
+    '''
+    Returns the list of segments that pack the given list of (*format*,
+    *item*) tuples, where *format* is the struct format of *item* or
+    None. Consecutive items that can be merged with the same byte order
+    give a segment with a single struct.Struct and the list of their
+    items, any other item gives a segment with None and a list with
+    only that item.
+    '''
+    segments = []
+    order = None
+    run = []
+    for format, item in items:
+        key = run_key(format) if format else None
+        if run and (key is None or key[0] != order):
+            segments.append(_run_segment(order, run))
+            run = []
+        if key is None:
+            segments.append((None, [item]))
+        else:
+            order = key[0]
+            run.append((key[1], item))
+    if run:
+        segments.append(_run_segment(order, run))
+    return segments
+
+def _run_segment(order, run):
+    format = order + "".join([format for format, item in run])
+    return (struct.Struct(format), [item for format, item in run])
@@ -24,13 +24,25 @@
 # along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
 #
 
+import bisect
+
+class IncompleteDataError(ValueError):
+    '''
+    Raised when a stream does not contain enough data to decode a
+    field. *missing* is the number of bytes that could not be read.
+    '''
+
+    def __init__(self, expected, read):
+        ValueError.__init__(self, "Data length mismatch (%d expected, "
+                            "%d read)" % (expected, read))
+        self.missing = expected - read
+
 def read_stream(stream, length):
     if length < 0:
         raise ValueError("Data length to read must be >= 0")
     data = stream.read(length)
     if len(data) != length:
-        raise ValueError("Data length mismatch (%d expected, %d read)" \
-                             % (length, len(data)))
+        raise IncompleteDataError(length, len(data))
     return data
 
 def write_stream(stream, length, data):
@@ -40,3 +52,189 @@ def write_stream(stream, length, data):
         raise ValueError("Data length mismatch (%d expected, %d found)" \
                              % (length, len(data)))
     stream.write(data)
+
+def buffer_view(buffer):
+    '''
+    Returns a one-dimensional unsigned byte memoryview of any object
+    supporting the buffer protocol (bytes, bytearray, mmap,
+    array.array...), without copying it.
+    '''
+    view = memoryview(buffer)
+    if view.format != "B" or view.ndim != 1:
+        view = view.cast("B")
+    return view
+
+def check_buffer(view, offset, length):
+    if offset < 0 or offset + length > len(view):
+        raise ValueError("Buffer too small (%d bytes needed at offset %d, "
+                         "buffer size is %d)" % (length, offset, len(view)))
+
+class BufferReader(object):
+    '''
+    A read-only byte stream on top of an object supporting the buffer
+    protocol. Reading returns memoryview slices of the underlying
+    buffer, so no data is copied.
+    '''
+
+    def __init__(self, buffer, offset = 0):
+        self.__view = buffer_view(buffer)
+        self.__pos = offset
+
+    def tell(self):
+        return self.__pos
+
+    def seek(self, pos, whence = 0):
+        if whence == 1:
+            pos += self.__pos
+        elif whence == 2:
+            pos += len(self.__view)
+        if pos < 0:
+            raise ValueError("Negative seek position %d" % pos)
+        self.__pos = pos
+        return pos
+
+    def read(self, length = -1):
+        start = self.__pos
+        if length < 0:
+            end = len(self.__view)
+        else:
+            end = min(start + length, len(self.__view))
+        end = max(start, end)
+        self.__pos = end
+        return self.__view[start:end]
+
+
+class BufferWriter(object):
+    '''
+    A byte stream that writes into a preallocated writable buffer
+    (bytearray, memoryview, mmap...) starting at a given offset.
+    '''
+
+    def __init__(self, buffer, offset = 0):
+        self.__view = buffer_view(buffer)
+        self.__pos = offset
+
+    def tell(self):
+        return self.__pos
+
+    def seek(self, pos, whence = 0):
+        if whence == 1:
+            pos += self.__pos
+        elif whence == 2:
+            pos += len(self.__view)
+        if pos < 0:
+            raise ValueError("Negative seek position %d" % pos)
+        self.__pos = pos
+        return pos
+
+    def write(self, data):
+        length = len(data)
+        check_buffer(self.__view, self.__pos, length)
+        self.__view[self.__pos:self.__pos + length] = data
+        self.__pos += length
+        return length
+
+
+class StreamCounter(object):
+    '''
+    A read-only byte stream that wraps another one and counts the
+    number of bytes read from it.
+    '''
+
+    def __init__(self, substream):
+        self.__substream = substream
+        self.__count = 0
+
+    def count(self):
+        return self.__count
+
+    def read(self, length = -1):
+        data = self.__substream.read(length)
+        self.__count += len(data)
+        return data
+
+
+class ChunkReader(object):
+    '''
+    A read-only byte stream formed by chunks of bytes that are appended
+    as they arrive. Reading data from a single chunk does not copy
+    it. Positions are absolute since the first appended byte, even
+    after old chunks are discarded. Reading more data than available
+    raises an *IncompleteDataError* exception without consuming
+    anything.
+    '''
+
+    def __init__(self):
+        self.__chunks = []
+        self.__starts = []
+        # Index of the first chunk that has not been discarded.
+        self.__first = 0
+        self.__begin = 0
+        self.__end = 0
+        self.__pos = 0
+
+    def append(self, data):
+        if len(data) > 0:
+            self.__chunks.append(bytes(data))
+            self.__starts.append(self.__end)
+            self.__end += len(data)
+
+    def available(self):
+        return self.__end - self.__pos
+
+    def discard(self):
+        '''
+        Forgets the chunks that are completely before the current
+        position.
+        '''
+        chunks = self.__chunks
+        first = self.__first
+        while first < len(chunks) and \
+                self.__starts[first] + len(chunks[first]) <= self.__pos:
+            self.__begin += len(chunks[first])
+            chunks[first] = None
+            first += 1
+        # Discarded chunks are only removed from the lists once they are
+        # half of them, so discarding is linear in the number of chunks.
+        if first > len(chunks) // 2:
+            del chunks[:first]
+            del self.__starts[:first]
+            first = 0
+        self.__first = first
+
+    def tell(self):
+        return self.__pos
+
+    def seek(self, pos, whence = 0):
+        if whence == 1:
+            pos += self.__pos
+        elif whence == 2:
+            pos += self.__end
+        if pos < self.__begin:
+            raise ValueError("Seek position %d has been discarded" % pos)
+        self.__pos = pos
+        return pos
+
+    def read(self, length = -1):
+        if length < 0:
+            length = self.available()
+        if length > self.available():
+            raise IncompleteDataError(length, self.available())
+        if length == 0:
+            return b""
+        start = self.__pos
+        end = start + length
+        i = bisect.bisect_right(self.__starts, start, self.__first) - 1
+        offset = start - self.__starts[i]
+        chunk = self.__chunks[i]
+        self.__pos = end
+        if offset + length <= len(chunk):
+            return memoryview(chunk)[offset:offset + length]
+        parts = [memoryview(chunk)[offset:]]
+        missing = length - len(parts[0])
+        while missing > 0:
+            i += 1
+            part = memoryview(self.__chunks[i])[:missing]
+            parts.append(part)
+            missing -= len(part)
+        return b"".join(parts)
@@ -22,21 +22,23 @@
 # along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
 #
 
-from BitPacket.writers.Writer import Writer
-from BitPacket.writers.WriterConfig import WriterConfig
-from BitPacket.writers.WriterTextBasic import WriterTextBasic
-from BitPacket.writers.WriterTextStream import WriterTextStream
-from BitPacket.writers.WriterTextStreamConfig import WriterTextStreamConfig
-from BitPacket.writers.WriterTextTable import WriterTextTable
-from BitPacket.writers.WriterTextTableConfig import WriterTextTableConfig
-from BitPacket.writers.WriterTextXML import WriterTextXML
+# Writers are imported the first time they are used, so gtk is only
+# imported when the GTK+ writers are used. They are not included in
+# __all__ for the same reason.
 
-__HAVE_GTK = True
-try:
-    from BitPacket.writers.WriterGtkTreeModel import WriterGtkTreeModel
-    from BitPacket.writers.WriterGtkTreeView import WriterGtkTreeView
-except ImportError as e:
-    __HAVE_GTK = False
+from BitPacket.utils.lazy import lazy_package
+
+lazy_package(__name__, {
+        "Writer" : [ "Writer" ],
+        "WriterConfig" : [ "WriterConfig" ],
+        "WriterGtkTreeModel" : [ "WriterGtkTreeModel" ],
+        "WriterGtkTreeView" : [ "WriterGtkTreeView" ],
+        "WriterTextBasic" : [ "WriterTextBasic" ],
+        "WriterTextStream" : [ "WriterTextStream" ],
+        "WriterTextStreamConfig" : [ "WriterTextStreamConfig" ],
+        "WriterTextTable" : [ "WriterTextTable" ],
+        "WriterTextTableConfig" : [ "WriterTextTableConfig" ],
+        "WriterTextXML" : [ "WriterTextXML" ] })
 
 __all__ =   [ "Writer",
               "WriterConfig",
@@ -46,7 +48,3 @@ __all__ =   [ "Writer",
               "WriterTextTable",
               "WriterTextTableConfig",
               "WriterTextXML" ]
-
-if __HAVE_GTK:
-    __all__.extend([ "WriterGtkTreeModel",
-                     "WriterGtkTreeView" ])
@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+#
+# @file    conftest.py
+# @brief   Test configuration
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 21:30
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import sys
+
+# Tests run against the sources, not against an installed BitPacket.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# The asyncio integration needs Python 3.5 or later.
+if sys.version_info < (3, 5):
+    collect_ignore = ["test_protocol.py"]
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+#
+# @file    test_array.py
+# @brief   Array tests
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 22:58
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from BitPacket import Array, BitField, BitStructure, NumericArray, Structure, \
+    UInt8, UInt16
+
+def element(root):
+    # The type of the elements depends on a previous field.
+    if root["kind"] == 1:
+        return UInt8("element")
+    return UInt16("element")
+
+def bits(root):
+    b = BitStructure("bits")
+    b.append(BitField("high", 4 * root["kind"]))
+    b.append(BitField("low", 8 - 4 * root["kind"]))
+    return b
+
+def packet(factory):
+    p = Structure("packet")
+    p.append(UInt8("kind"))
+    p.append(Array("elements", UInt8("count"), factory))
+    return p
+
+def test_reuse_elements():
+    p = packet(element)
+    p.set_bytes(b"\x01\x03\x01\x02\x03")
+    elements = p.field("elements").fields()[1:]
+    p.set_bytes(b"\x01\x02\x04\x05")
+    assert p.field("elements").fields()[1:] == elements[:2]
+    assert p.bytes() == b"\x01\x02\x04\x05"
+
+def test_factory_switching_type():
+    p = packet(element)
+    p.set_bytes(b"\x01\x02\x01\x02")
+    assert [e.value() for e in p.field("elements").fields()[1:]] == [1, 2]
+
+    p.set_bytes(b"\x02\x03\x00\x01\x00\x02\x00\x03")
+    elements = p.field("elements").fields()[1:]
+    assert [type(e) for e in elements] == [UInt16] * 3
+    assert [e.value() for e in elements] == [1, 2, 3]
+    assert p.bytes() == b"\x02\x03\x00\x01\x00\x02\x00\x03"
+
+    p.set_bytes(b"\x01\x01\x07")
+    assert p.field("elements").fields()[1].value() == 7
+    assert p.bytes() == b"\x01\x01\x07"
+
+def test_factory_switching_layout():
+    p = packet(bits)
+    p.set_bytes(b"\x01\x01\x12")
+    assert p["elements.0.high"] == 1
+
+    p.set_bytes(b"\x02\x01\x12")
+    assert p["elements.0.high"] == 0x12
+    assert p["elements.0.low"] == 0
+
+def test_numeric_array_keys():
+    p = Structure("packet")
+    p.append(UInt8("id"))
+    p.append(NumericArray("s", UInt8("n"), UInt16))
+    assert p.keys() == ["id", "s.n"]
+    assert p.size() == 2
+
+    p.set_bytes(b"\x01\x02\x00\x01\x00\x02")
+    assert p.keys() == ["id", "s.n", "s.0", "s.1"]
+    assert p.size() == 6
+    assert p["s.1"] == 2
+
+    p.set_bytes(b"\x01\x01\x00\x03")
+    assert p.keys() == ["id", "s.n", "s.0"]
+    assert p.size() == 4
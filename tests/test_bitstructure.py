@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+#
+# @file    test_bitstructure.py
+# @brief   Bit engine tests
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 23:14
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+from io import BytesIO
+
+import pytest
+
+from BitPacket import BitField, BitStructure, Boolean, Structure, UInt8
+from BitPacket.utils.bitstream import BitStreamReader, BitStreamWriter
+from BitPacket.utils.stream import IncompleteDataError
+
+def header():
+    bs = BitStructure("header")
+    bs.append(BitField("version", 3, 5))
+    bs.append(Boolean("flag", True))
+    bs.append(BitField("apid", 11, 0x7ab))
+    bs.append(BitField("tail", 1, 1))
+    return bs
+
+def test_round_trip():
+    bs = header()
+    assert bs.size() == 2
+    assert bs.bytes() == b"\xbf\x57"
+
+    other = header()
+    for key in other.keys():
+        other[key] = 0
+    other.set_bytes(b"\xbf\x57")
+    assert [other[key] for key in other.keys()] == [5, 1, 0x7ab, 1]
+
+def test_padding():
+    bs = BitStructure("bits")
+    bs.append(BitField("a", 4, 0xf))
+    bs.append(BitField("b", 5, 0x11))
+    assert bs.size() == 2
+    assert bs.bytes() == b"\xf8\x80"
+
+    bs.set_bytes(b"\x12\xff")
+    assert bs["a"] == 1
+    assert bs["b"] == 0x5
+
+    s = Structure("s")
+    s.append(bs)
+    s.append(UInt8("after", 7))
+    assert s.bytes() == b"\x12\x80\x07"
+
+def test_oversized_value():
+    field = BitField("a", 3)
+    with pytest.raises(ValueError):
+        field.set_value(8)
+    with pytest.raises(ValueError):
+        field.set_value(-1)
+    field.set_value(7)
+    assert field.value() == 7
+
+    writer = BitStreamWriter(BytesIO())
+    with pytest.raises(ValueError):
+        writer.write(4, 2)
+
+def test_short_input():
+    with pytest.raises(IncompleteDataError):
+        header().set_bytes(b"\xbf")
+
+    reader = BitStreamReader(BytesIO(b"\xa5"))
+    assert reader.read(3) == 5
+    assert reader.read(5) == 5
+    with pytest.raises(IncompleteDataError):
+        reader.read(1)
+
+def test_stream_round_trip():
+    stream = BytesIO()
+    writer = BitStreamWriter(stream)
+    writer.write(1, 1)
+    writer.write(0x1234, 16)
+    writer.write(0, 2)
+    writer.close()
+    assert stream.getvalue() == b"\x89\x1a\x00"
+
+    reader = BitStreamReader(BytesIO(stream.getvalue()))
+    assert reader.read(1) == 1
+    assert reader.read(16) == 0x1234
+    assert reader.read(7) == 0
+    reader.close()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+#
+# @file    test_container.py
+# @brief   Container tests
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 22:20
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import struct
+
+import pytest
+
+from BitPacket import Array, BitField, BitStructure, Data, Field, \
+    MetaField, Structure, Template, UInt8, UInt16
+from BitPacket.Field import FieldLayout
+
+def packet():
+    p = Structure("packet")
+    p.append(UInt8("id", 1))
+    p.append(UInt16("sequence", 2))
+    return p
+
+def test_patch_invalid_value_keeps_buffer():
+    buffer = bytearray(b"\x01\x00\x02")
+    with pytest.raises(struct.error):
+        packet().patch(buffer, "sequence", 0x10000)
+    assert buffer == b"\x01\x00\x02"
+
+    packet().patch(buffer, "sequence", 0x0304)
+    assert buffer == b"\x01\x03\x04"
+
+def test_template_invalid_value():
+    template = Template(packet(), ["sequence"])
+    with pytest.raises(struct.error):
+        template.build({"sequence": -1})
+    assert template.build({"sequence": 3}) == b"\x01\x00\x03"
+
+def nested(first, second):
+    p = Structure("packet")
+    for name in (first, second):
+        s = Structure(name)
+        s.append(UInt8("id"))
+        p.append(s)
+    return p
+
+def test_accessor_checks_the_whole_key():
+    accessor = nested("a", "b").accessor("b.id")
+    other = nested("b", "a")
+    accessor.set_value(other, 7)
+    assert other["b.id"] == 7
+    assert other["a.id"] == 0
+    assert accessor.value(other) == 7
+
+class Scaled(UInt16):
+
+    # A value kept in tenths in the packet.
+
+    def value(self):
+        return UInt16.value(self) / 10.0
+
+    def set_value(self, value):
+        UInt16.set_value(self, int(round(value * 10)))
+
+class Half(BitField):
+
+    # A bit field that shows half of its value.
+
+    def value(self):
+        return BitField.value(self) / 2.0
+
+    def set_value(self, value):
+        BitField.set_value(self, int(value * 2))
+
+def custom():
+    p = Structure("packet")
+    p.append(UInt8("id", 1))
+    p.append(Scaled("scaled", 0.5))
+    bits = BitStructure("bits")
+    bits.append(Half("half", 4, 1.5))
+    bits.append(BitField("other", 4, 2))
+    p.append(bits)
+    return p
+
+def test_peek_custom_fields():
+    p = custom()
+    data = p.bytes()
+    assert data == b"\x01\x00\x05\x32"
+    assert p.peek(data, "id") == 1
+    assert p.peek(data, "bits.other") == 2
+    with pytest.raises(TypeError):
+        p.peek(data, "scaled")
+    with pytest.raises(TypeError):
+        p.peek(data, "bits.half")
+
+def test_patch_custom_fields():
+    p = custom()
+    buffer = bytearray(p.bytes())
+    with pytest.raises(TypeError):
+        p.patch(buffer, "scaled", 1.5)
+    with pytest.raises(TypeError):
+        p.patch(buffer, "bits.half", 1)
+    assert buffer == p.bytes()
+
+def test_template_custom_fields():
+    template = Template(custom(), ["id", "scaled"])
+    assert template.build({"id": 2, "scaled": 1.5}) == b"\x02\x00\x0f\x32"
+    assert template.build() == b"\x01\x00\x05\x32"
+    with pytest.raises(TypeError):
+        Template(custom(), ["bits.half"])
+
+class Varying(Field):
+
+    # A field whose size changes without notifying it.
+
+    def __init__(self, name):
+        Field.__init__(self, name)
+        self.data = b""
+
+    def size(self):
+        return len(self.data)
+
+    def _encode(self, stream):
+        stream.write(self.data)
+
+def test_size_of_custom_fields():
+    s = Structure("s")
+    s.append(UInt16("a"))
+    inner = Structure("inner")
+    inner.append(Varying("v"))
+    s.append(inner)
+    assert s.size() == 2
+    inner.field("v").data = b"abc"
+    assert s.size() == len(s.bytes()) == 5
+
+def header():
+    p = Structure("packet")
+    p.append(UInt8("id", 1))
+    bits = BitStructure("bits")
+    bits.append(BitField("version", 3, 5))
+    bits.append(BitField("apid", 13, 0x123))
+    p.append(bits)
+    p.append(UInt16("sequence", 0x0405))
+    return p
+
+def test_layout_and_peek():
+    p = header()
+    assert p.layout() == [
+        FieldLayout("id", 0, 1, None, None),
+        FieldLayout("bits.version", 1, 2, 0, 3),
+        FieldLayout("bits.apid", 1, 2, 3, 13),
+        FieldLayout("sequence", 3, 2, None, None)]
+    assert [layout.key for layout in p.layout()] == p.keys()
+
+    data = b"\xff" + p.bytes()
+    for key in p.keys():
+        assert p.peek(data, key, 1) == p[key]
+
+def test_peek_errors():
+    p = header()
+    data = p.bytes()
+    with pytest.raises(KeyError):
+        p.peek(data, "bits")
+    with pytest.raises(KeyError):
+        p.peek(data, "unknown")
+    with pytest.raises(ValueError):
+        p.peek(data[:4], "sequence")
+    with pytest.raises(ValueError):
+        p.peek(data, "bits.apid", 4)
+
+    p.append(Data("data", UInt8("length")))
+    with pytest.raises(ValueError):
+        p.layout()
+
+def sized():
+    p = Structure("packet")
+    p.append(UInt8("kind", 2))
+    inner = Structure("inner")
+    inner.append(Data("data", UInt8("length")))
+    p.append(inner)
+    p.append(Array("elements", UInt8("count"),
+                   lambda root: UInt16("element")))
+    p.append(MetaField("body", lambda root: Data("body", UInt8("length"))))
+    return p
+
+def test_cached_size_changes():
+    p = sized()
+    p.set_bytes(b"\x02\x01a\x01\x00\x01\x00")
+    assert p.size() == len(p.bytes()) == 7
+
+    p["inner.data"] = b"abc"
+    assert p.size() == len(p.bytes()) == 9
+
+    p.set_bytes(b"\x02\x00\x02\x00\x01\x00\x02\x02xy")
+    assert p.size() == len(p.bytes()) == 10
+
+    p.field("elements").append(UInt16("element", 3))
+    assert p.size() == len(p.bytes()) == 12
+
+    p.field("inner").reset()
+    assert p.size() == len(p.bytes()) == 11
+
+def test_cached_size_after_decoding_error():
+    p = sized()
+    p.set_bytes(b"\x02\x01a\x01\x00\x01\x00")
+    assert p.size() == 7
+    with pytest.raises(ValueError):
+        p.set_bytes(b"\x02\x03abc\x02\x00\x01")
+    assert p.size() == len(p.bytes())
+
+def test_key_index_changes():
+    p = sized()
+    p.set_bytes(b"\x02\x01a\x01\x00\x01\x00")
+    keys = ["kind", "inner.data.length", "inner.data.Data",
+            "elements.count", "elements.0", "body.length", "body.Data"]
+    assert p.keys() == keys
+    assert [p.field(key).name() for key in keys] == \
+        [key.split(".")[-1] for key in keys]
+    assert p["elements.0"] == 1
+
+    p.set_bytes(b"\x02\x00\x02\x00\x01\x00\x02\x00")
+    assert p.keys() == ["kind", "inner.data.length", "inner.data.Data",
+                        "elements.count", "elements.0", "elements.1",
+                        "body.length", "body.Data"]
+    assert p["elements.1"] == 2
+
+    p.field("inner").append(UInt8("extra", 9))
+    assert "inner.extra" in p.keys()
+    assert p["inner.extra"] == 9
+
+    p.field("inner").reset()
+    assert "inner.extra" not in p.keys()
+    with pytest.raises(KeyError):
+        p.field("inner.extra")
+    with pytest.raises(KeyError):
+        p["elements.2"]
+
+def test_root_of_bottom_up_structures():
+    leaf = UInt8("leaf")
+    inner = Structure("inner")
+    inner.append(leaf)
+    assert leaf.root() is inner
+
+    middle = Structure("middle")
+    middle.append(inner)
+    outer = Structure("outer")
+    outer.append(middle)
+    assert leaf.root() is outer
+    assert leaf.parent() is inner
+    assert inner.root() is outer
+
+    del outer
+    assert leaf.root() is middle
+    assert middle.parent() is None
+
+def test_root_of_array_elements():
+    roots = []
+    def element(root):
+        roots.append(root)
+        return UInt8("element")
+    p = Structure("packet")
+    s = Structure("inner")
+    s.append(Array("elements", UInt8("count"), element))
+    p.append(s)
+    p.set_bytes(b"\x02\x01\x02")
+    assert roots and all(root is p for root in roots)
+    assert p.field("inner.elements.1").root() is p
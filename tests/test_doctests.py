@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+#
+# @file    test_doctests.py
+# @brief   Runs the examples in the module documentation
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 23:20
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import array
+import doctest
+import importlib
+import sys
+
+from io import BytesIO
+
+import pytest
+
+import BitPacket
+
+# Modules whose examples can be run. The examples of the older modules
+# are written for Python 2 only.
+MODULES = [ "Accessor",
+            "NumericArray",
+            "PacketParser",
+            "PacketReader",
+            "Schema",
+            "SchemaCache",
+            "SchemaCompiler",
+            "Template" ]
+
+def example_globals():
+    names = dict([(name, getattr(BitPacket, name))
+                  for name in BitPacket.__all__])
+    names.update(array = array.array, BytesIO = BytesIO)
+    return names
+
+@pytest.mark.parametrize("name", MODULES)
+def test_module_examples(name):
+    # The package exports objects with the same name as their module.
+    importlib.import_module("BitPacket." + name)
+    module = sys.modules["BitPacket." + name]
+    failed, attempted = doctest.testmod(module, extraglobs = example_globals(),
+                                        report = False)
+    assert attempted > 0
+    assert failed == 0
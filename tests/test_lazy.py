@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+#
+# @file    test_lazy.py
+# @brief   Lazy decoding tests
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 21:41
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import pytest
+
+from BitPacket import Array, Data, Structure, UInt8, UInt16
+
+class Elements(object):
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.created = 0
+
+    def __call__(self, root):
+        self.created += 1
+        return self.factory()
+
+def sample():
+    return UInt16("sample")
+
+def record():
+    r = Structure("record")
+    r.append(UInt8("id"))
+    r.append(Data("data", UInt8("length")))
+    return r
+
+def packet(elements):
+    p = Structure("packet")
+    p.append(UInt8("id"))
+    p.append(Array("elements", UInt8("count"), elements))
+    p.append(UInt8("tail"))
+    return p
+
+def test_lazy_end_offset_does_not_decode_fixed_size_elements():
+    elements = Elements(sample)
+    p = packet(elements)
+    data = b"\x07\x03\x00\x01\x00\x02\x00\x03\x09"
+    assert p.set_buffer(b"\xff" + data + b"\xff", 1, lazy = True) == 10
+    assert elements.created == 1
+
+    assert p["tail"] == 9
+    assert elements.created == 1
+    assert p["elements.2"] == 3
+    assert p.bytes() == data
+
+def test_lazy_end_offset_of_variable_size_elements():
+    elements = Elements(record)
+    p = packet(elements)
+    data = b"\x07\x02\x01\x02ab\x02\x00\x09"
+    assert p.set_bytes(data, lazy = True) is None
+    assert p.set_buffer(data, 0, lazy = True) == len(data)
+    assert p["tail"] == 9
+    assert p["elements.0.data"] == b"ab"
+    assert p["elements.1.data"] == b""
+    assert p.bytes() == data
+
+class Checked(Structure):
+
+    def __init__(self):
+        Structure.__init__(self, "s")
+        self.append(UInt8("a"))
+        self.append(UInt8("sum"))
+
+    def _decode(self, stream):
+        Structure._decode(self, stream)
+        if self["a"] != self["sum"]:
+            raise ValueError("bad checksum")
+
+def checked_packet():
+    p = Structure("packet")
+    p.append(UInt8("id"))
+    p.append(Checked())
+    return p
+
+def test_lazy_custom_decode():
+    p = checked_packet()
+    p.set_bytes(b"\x01\x02\x02", lazy = True)
+    assert p["s.a"] == 2
+
+    p = checked_packet()
+    p.set_bytes(b"\x01\x01\x02", lazy = True)
+    with pytest.raises(ValueError):
+        p["s.a"]
+    with pytest.raises(ValueError):
+        Checked().set_bytes(b"\x01\x02", lazy = True)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+#
+# @file    test_packet_parser.py
+# @brief   PacketParser tests
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 10:05
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import pytest
+
+from BitPacket import MetaField, PacketParser, Structure, UInt8, UInt16
+
+def body(root):
+    if root["kind"] == 1:
+        return UInt8("body")
+    raise ValueError("Unknown packet kind %d" % root["kind"])
+
+class Checked(Structure):
+
+    # The last byte is the sum of the other ones.
+
+    def __init__(self):
+        Structure.__init__(self, "checked")
+        self.append(UInt8("a"))
+        self.append(UInt8("b"))
+        self.append(UInt8("sum"))
+
+    def _decode(self, stream):
+        Structure._decode(self, stream)
+        if (self["a"] + self["b"]) % 256 != self["sum"]:
+            raise ValueError("bad checksum")
+
+class Packet(Structure):
+
+    def __init__(self):
+        Structure.__init__(self, "packet")
+        self.append(UInt8("kind"))
+        self.append(MetaField("body", body))
+
+def test_split_packets():
+    parser = PacketParser(Packet)
+    assert parser.feed(b"\x01") == []
+    assert parser.missing() == 1
+    packets = parser.feed(b"\x02\x01\x03\x01")
+    assert [(offset, p["body"]) for offset, p in packets] == [(0, 2), (2, 3)]
+    assert parser.pending()
+
+def test_error_discards_fed_data():
+    parser = PacketParser(Packet)
+    with pytest.raises(ValueError):
+        parser.feed(b"\x09\x02")
+    assert not parser.pending()
+    packets = parser.feed(b"\x01\x05")
+    assert [(offset, p["body"]) for offset, p in packets] == [(2, 5)]
+    assert not parser.pending()
+
+def test_error_in_partial_packet():
+    parser = PacketParser(Packet)
+    assert parser.feed(b"\x01") == []
+    with pytest.raises(ValueError):
+        parser.feed(b"\x04\x09\x00")
+    packets = parser.feed(b"\x01\x06")
+    assert [(offset, p["body"]) for offset, p in packets] == [(4, 6)]
+
+def test_custom_decode():
+    parser = PacketParser(Checked)
+    assert parser.feed(b"\x01") == []
+    packets = parser.feed(b"\x02\x03")
+    assert [(offset, p["sum"]) for offset, p in packets] == [(0, 3)]
+    with pytest.raises(ValueError):
+        parser.feed(b"\x01\x02\x04")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+#
+# @file    test_packet_reader.py
+# @brief   PacketReader tests
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 21:52
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from BitPacket import PacketReader, Structure, UInt8, UInt16
+
+class Packet(Structure):
+
+    def __init__(self):
+        Structure.__init__(self, "packet")
+        self.append(UInt8("id"))
+        self.append(UInt16("address"))
+
+class PartialStream(object):
+
+    # A stream that, like a pipe, only has a few bytes available at a
+    # time and blocks on read() until all the requested bytes arrive.
+
+    def __init__(self, data, available):
+        self.data = data
+        self.available = available
+
+    def read(self, size):
+        raise AssertionError("read() would block")
+
+    def read1(self, size):
+        chunk = self.data[:min(size, self.available)]
+        self.data = self.data[len(chunk):]
+        return chunk
+
+def test_read_available_bytes():
+    stream = PartialStream(b"\x01\x00\x02\x03\x00\x04\x05", 2)
+    reader = PacketReader(stream, Packet)
+    packets = [(offset, p["id"], p["address"]) for offset, p in reader]
+    assert packets == [(0, 1, 2), (3, 3, 4)]
+    assert reader.remainder() == b"\x05"
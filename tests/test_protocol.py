@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+#
+# @file    test_protocol.py
+# @brief   asyncio integration tests
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 22:12
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import asyncio
+
+import pytest
+
+from BitPacket import PacketDatagramProtocol, Structure, UInt8, UInt16, \
+    read_packet
+from BitPacket.utils.stream import IncompleteDataError
+
+class Packet(Structure):
+
+    def __init__(self, id = 0, address = 0):
+        Structure.__init__(self, "packet")
+        self.append(UInt8("id", id))
+        self.append(UInt16("address", address))
+
+class Checked(Packet):
+
+    # The address must be twice the id.
+
+    def _decode(self, stream):
+        Packet._decode(self, stream)
+        if self["address"] != 2 * self["id"]:
+            raise ValueError("bad address")
+
+class Reader(object):
+
+    def __init__(self, data):
+        self.data = data
+
+    async def readexactly(self, size):
+        data, self.data = self.data[:size], self.data[size:]
+        if len(data) < size:
+            raise asyncio.IncompleteReadError(data, size)
+        return data
+
+class Protocol(PacketDatagramProtocol):
+
+    def __init__(self):
+        PacketDatagramProtocol.__init__(self, Packet)
+        self.received = asyncio.Queue()
+
+    def packet_received(self, packet, addr):
+        self.received.put_nowait((packet["id"], packet["address"]))
+
+    def packet_error(self, error, data, addr):
+        self.received.put_nowait((type(error), bytes(data)))
+
+def test_read_packet_from_stream():
+    async def main():
+        packets = []
+        done = asyncio.Event()
+
+        async def handle(reader, writer):
+            try:
+                while True:
+                    packet = Packet()
+                    await read_packet(packet, reader)
+                    packets.append((packet["id"], packet["address"]))
+            except asyncio.IncompleteReadError as err:
+                packets.append(err.partial)
+            writer.close()
+            done.set()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        # Packets split in several writes.
+        for data in [b"\x01\x00", b"\x02\x03", b"\x00\x04\x05"]:
+            writer.write(data)
+            await writer.drain()
+            await asyncio.sleep(0.01)
+        writer.close()
+        await asyncio.wait_for(done.wait(), 5)
+        server.close()
+        await server.wait_closed()
+        return packets
+
+    assert asyncio.run(main()) == [(1, 2), (3, 4), b"\x05"]
+
+def test_read_packet_custom_decode():
+    async def main():
+        reader = Reader(b"\x01\x00\x02\x01\x00\x03")
+        packet = Checked()
+        await read_packet(packet, reader)
+        assert packet["address"] == 2
+        with pytest.raises(ValueError):
+            await read_packet(Checked(), reader)
+
+    asyncio.run(main())
+
+def test_datagram_protocol():
+    async def main():
+        loop = asyncio.get_running_loop()
+        transport, protocol = await loop.create_datagram_endpoint(
+            Protocol, local_addr = ("127.0.0.1", 0))
+        addr = transport.get_extra_info("sockname")
+        sender, _ = await loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol, remote_addr = addr)
+        received = []
+        for data in [Packet(1, 2).bytes(), b"\x03\x00", b"\x05\x00\x06\x07"]:
+            sender.sendto(data)
+            received.append(await asyncio.wait_for(protocol.received.get(),
+                                                   5))
+        sender.close()
+        transport.close()
+        return received
+
+    assert asyncio.run(main()) == [(1, 2),
+                                   (IncompleteDataError, b"\x03\x00"),
+                                   (ValueError, b"\x05\x00\x06\x07")]
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+#
+# @file    test_schema.py
+# @brief   Schema tests
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 22:31
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import pytest
+
+from BitPacket import BitField, BitStructure, Data, Schema, Structure, \
+    UInt8, UInt16
+
+class MyStructure(Structure):
+
+    def __init__(self, id_type = UInt8):
+        Structure.__init__(self, "mystructure")
+        self.append(id_type("id"))
+        self.append(UInt16("sequence"))
+        self.append(Data("data", UInt8("length")))
+
+DATA = b"\x01\x00\x07\x03abc"
+
+def test_records_of_equal_schemas_are_equal():
+    first = Schema(MyStructure()).decode(DATA)
+    second = Schema(MyStructure(), compiled = True).decode(DATA)
+    assert first == second
+    assert hash(first) == hash(second)
+
+def test_records_of_different_schemas_are_not_equal():
+    first = Schema(MyStructure()).decode(DATA)
+    second = Schema(MyStructure(UInt16)).decode(b"\x00" + DATA)
+    assert first != second
+
+class Scaled(UInt16):
+
+    # A value kept in tenths in the packet.
+
+    def value(self):
+        return UInt16.value(self) / 10.0
+
+    def set_value(self, value):
+        UInt16.set_value(self, int(round(value * 10)))
+
+class Checked(Structure):
+
+    # The last byte is checked on decoding.
+
+    def __init__(self):
+        Structure.__init__(self, "checked")
+        self.append(UInt8("a"))
+        self.append(UInt8("check"))
+
+    def _decode(self, stream):
+        Structure._decode(self, stream)
+        if self["check"] != self["a"]:
+            raise ValueError("Invalid check")
+
+class Half(BitField):
+
+    # A bit field that shows half of its value.
+
+    def value(self):
+        return BitField.value(self) / 2.0
+
+def test_custom_fields_are_not_compiled():
+    s = Structure("s")
+    s.append(Scaled("scaled"))
+    with pytest.raises(TypeError):
+        Schema(s)
+
+    s = Structure("s")
+    s.append(Checked())
+    with pytest.raises(TypeError):
+        Schema(s)
+
+    bits = BitStructure("bits")
+    bits.append(Half("half", 8))
+    with pytest.raises(TypeError):
+        bits._schema()
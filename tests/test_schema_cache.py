@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+#
+# @file    test_schema_cache.py
+# @brief   SchemaCache tests
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 22:40
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import functools
+import importlib
+import os
+import pickle
+import struct
+import sys
+
+import pytest
+
+from BitPacket import SchemaCache, Structure, UInt8, UInt16
+
+class MyStructure(Structure):
+
+    def __init__(self):
+        Structure.__init__(self, "mystructure")
+        self.append(UInt8("id"))
+        self.append(UInt16("sequence"))
+
+DATA = b"\x01\x00\x07"
+
+def schema_files(directory):
+    return [os.path.join(directory, name)
+            for name in os.listdir(directory) if name.endswith(".schema")]
+
+def test_broken_code_is_ignored(tmpdir):
+    directory = str(tmpdir)
+    SchemaCache(directory).schema(MyStructure)
+    for path in schema_files(directory):
+        with open(path, "rb") as f:
+            node, decode, encode = pickle.load(f)
+        with open(path, "wb") as f:
+            pickler = pickle.Pickler(f)
+            pickler.dispatch_table = {
+                struct.Struct : lambda s: (struct.Struct, (s.format,)) }
+            pickler.dump((node, (b"broken", decode[1]), encode))
+
+    schema = SchemaCache(directory).schema(MyStructure)
+    assert schema.decode(DATA)["sequence"] == 7
+
+def structure(id_type):
+    s = Structure("s")
+    s.append(id_type("id"))
+    return s
+
+def test_definitions_without_name_need_a_key(tmpdir):
+    cache = SchemaCache(str(tmpdir))
+    with pytest.raises(ValueError):
+        cache.schema(lambda: structure(UInt8))
+    with pytest.raises(ValueError):
+        cache.schema(functools.partial(structure, UInt8))
+
+    schemas = [cache.schema(lambda: structure(UInt8), key = "uint8"),
+               cache.schema(functools.partial(structure, UInt16),
+                            key = "uint16")]
+    assert [s.decode(b"\x01\x02")["id"] for s in schemas] == [1, 0x0102]
+
+HELPER = """
+from BitPacket import %s
+
+def header():
+    return %s("id")
+"""
+
+class HelperStructure(Structure):
+
+    def __init__(self):
+        Structure.__init__(self, "helper")
+        self.append(sys.modules["schema_cache_helper"].header())
+
+def test_helper_module_changes_invalidate_schemas(tmpdir):
+    directory = str(tmpdir.mkdir("cache"))
+    path = tmpdir.join("schema_cache_helper.py")
+    path.write(HELPER % ("UInt8", "UInt8"))
+    sys.path.insert(0, str(tmpdir))
+    try:
+        importlib.import_module("schema_cache_helper")
+        schema = SchemaCache(directory).schema(HelperStructure)
+        assert schema.decode(b"\x01")["id"] == 1
+
+        path.write(HELPER % ("UInt16", "UInt16"))
+        # Make sure the modification is noticed even on coarse clocks.
+        stat = os.stat(str(path))
+        os.utime(str(path), ns = (stat.st_atime_ns,
+                                  stat.st_mtime_ns + 1000000000))
+        importlib.reload(sys.modules["schema_cache_helper"])
+        schema = SchemaCache(directory).schema(HelperStructure)
+        assert schema.decode(b"\x01\x02")["id"] == 0x0102
+    finally:
+        sys.path.remove(str(tmpdir))
+        del sys.modules["schema_cache_helper"]
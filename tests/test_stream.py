@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+#
+# @file    test_stream.py
+# @brief   Byte stream tests
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 22:03
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import pytest
+
+from BitPacket.utils.stream import ChunkReader, IncompleteDataError
+
+def test_chunk_reader_discard():
+    reader = ChunkReader()
+    for i in range(1000):
+        reader.append(bytes(bytearray([i % 256, 0])))
+    for i in range(999):
+        assert bytes(reader.read(2)) == bytes(bytearray([i % 256, 0]))
+        reader.discard()
+    with pytest.raises(ValueError):
+        reader.seek(1997)
+    reader.seek(1998)
+    reader.append(b"\x01\x02")
+    assert bytes(reader.read(3)) == b"\xe7\x00\x01"
+    with pytest.raises(IncompleteDataError):
+        reader.read(2)
+    assert reader.available() == 1
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+#
+# @file    test_structure.py
+# @brief   Structure tests
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 21:32
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+from io import BytesIO
+
+import pytest
+
+from BitPacket import BitField, BitStructure, Data, NumericArray, \
+    Structure, UInt8, UInt16, UInt16LE
+from BitPacket.utils.stream import IncompleteDataError
+
+class Scaled(UInt16):
+
+    # A value kept in tenths in the packet.
+
+    def __init__(self, name, value = 0):
+        UInt16.__init__(self, name)
+        self.set_value(value)
+
+    def value(self):
+        return UInt16.value(self) / 10.0
+
+    def set_value(self, value):
+        UInt16.set_value(self, int(round(value * 10)))
+
+def scaled_structure():
+    s = Structure("s")
+    s.append(UInt8("a"))
+    s.append(Scaled("b"))
+    s.append(UInt8("c"))
+    return s
+
+def test_overridden_value_is_not_compiled():
+    s = scaled_structure()
+    s.set_bytes(b"\x01\x00\x19\x02")
+    assert s["a"] == 1
+    assert s["b"] == 2.5
+    assert s["c"] == 2
+
+    s["b"] = 1.5
+    assert s.bytes() == b"\x01\x00\x0f\x02"
+
+def flat_structure():
+    s = Structure("s")
+    s.append(UInt8("a"))
+    s.append(UInt16("b"))
+    return s
+
+def data_structure():
+    s = Structure("s")
+    s.append(UInt8("a"))
+    s.append(Data("data", UInt8("length")))
+    return s
+
+@pytest.mark.parametrize("structure", [flat_structure, data_structure])
+def test_decode_iter_short_count(structure):
+    stream = BytesIO(b"\x01\x00\x02" * 2)
+    with pytest.raises(IncompleteDataError):
+        list(structure().decode_iter(stream, 3))
+
+def test_decode_iter_flat_until_end():
+    stream = BytesIO(b"\x01\x00\x02" * 2)
+    assert list(flat_structure().decode_iter(stream)) == [(1, 2), (1, 2)]
+
+def test_decode_many_records_do_not_reference_buffers():
+    buffer = bytearray(b"\x01\x02ab")
+    records = data_structure().decode_many([buffer])
+    buffer[:] = b"\x01\x00"
+    assert records == [(1, 2, b"ab")]
+
+class Saturated(UInt8):
+
+    # Always encoded as 0xff.
+
+    def _encode(self, stream):
+        stream.write(b"\xff")
+
+class Summed(Structure):
+
+    # The last field is filled in with the sum of the other ones.
+
+    def __init__(self):
+        Structure.__init__(self, "summed")
+        self.append(UInt8("a", 5))
+        self.append(UInt8("b", 2))
+        self.append(UInt8("sum"))
+
+    def _encode(self, stream):
+        self["sum"] = self["a"] + self["b"]
+        Structure._encode(self, stream)
+
+def test_encode_into_custom_encode():
+    buffer = bytearray(3)
+    assert Saturated("v", 1).encode_into(buffer, 1) == 2
+    assert buffer == b"\x00\xff\x00"
+
+    s = Structure("s")
+    s.append(UInt8("a", 1))
+    s.append(Saturated("v", 1))
+    assert s.bytes() == b"\x01\xff"
+    assert s.encode_into(buffer) == 2
+    assert buffer == b"\x01\xff\x00"
+
+    assert Summed().encode_into(buffer) == 3
+    assert buffer == Summed().bytes() == b"\x05\x02\x07"
+
+def mixed():
+    s = Structure("mixed")
+    s.append(UInt8("id", 1))
+    bits = BitStructure("bits")
+    bits.append(BitField("high", 4, 0xa))
+    bits.append(BitField("low", 4, 0x5))
+    s.append(bits)
+    s.append(UInt16("sequence", 0x0203))
+    s.append(Data("data", UInt8("length")))
+    s["data"] = b"abc"
+    samples = NumericArray("samples", UInt8("count"), UInt16LE)
+    samples.set_bytes(b"\x02\x04\x00\x05\x00")
+    s.append(samples)
+    return s
+
+def test_encode_into_round_trip():
+    s = mixed()
+    data = s.bytes()
+    buffer = bytearray(len(data) + 4)
+    assert s.encode_into(buffer, 2) == len(data) + 2
+    assert buffer == b"\x00\x00" + data + b"\x00\x00"
+
+    other = mixed()
+    other.set_bytes(bytes(buffer[2:-2]))
+    assert other.bytes() == data
+
+def test_encode_into_small_buffer():
+    s = mixed()
+    size = s.size()
+    for offset in (-1, 1):
+        with pytest.raises(ValueError):
+            s.encode_into(bytearray(size), offset)
+    with pytest.raises(ValueError):
+        UInt16("a").encode_into(bytearray(1))
+    with pytest.raises(ValueError):
+        s.encode_into(bytearray(size - 1))
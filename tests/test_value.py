@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+#
+# @file    test_value.py
+# @brief   Numeric value tests
+# @author  Aleix Conchillo Flaque <aconchillo@gmail.com>
+# @date    Fri Oct 16, 2026 23:26
+#
+# Copyright (C) 2026 Aleix Conchillo Flaque
+#
+# This file is part of BitPacket.
+#
+# BitPacket is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# BitPacket is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with BitPacket.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+
+import struct
+
+import pytest
+
+from BitPacket import DoubleLE, FloatBE, Int8, Int32LE, UInt16BE, UInt16LE
+from BitPacket.Value import _value_struct
+
+def test_round_trip():
+    for field, value, data in [(Int8("a", -2), -2, b"\xfe"),
+                               (UInt16LE("a", 0x0102), 0x0102, b"\x02\x01"),
+                               (UInt16BE("a", 0x0102), 0x0102, b"\x01\x02"),
+                               (Int32LE("a", -1), -1, b"\xff" * 4),
+                               (DoubleLE("a", 0.5), 0.5,
+                                b"\x00" * 6 + b"\xe0\x3f")]:
+        assert field.value() == value
+        assert field.bytes() == data
+        assert field.hex_value() == int(data.hex(), 16)
+        field.set_bytes(b"\x00" * len(data))
+        assert field.value() == 0
+        field.set_bytes(data)
+        assert field.value() == value
+
+def test_float_precision():
+    field = FloatBE("a", 0.1)
+    assert field.value() == struct.unpack(">f", struct.pack(">f", 0.1))[0]
+    assert field.value() != 0.1
+
+def test_invalid_value_keeps_value():
+    field = UInt16LE("a", 3)
+    for value in (-1, 0x10000, "3"):
+        with pytest.raises(struct.error):
+            field.set_value(value)
+    assert field.value() == 3
+    assert field.bytes() == b"\x03\x00"
+
+def test_short_input():
+    field = UInt16LE("a", 3)
+    with pytest.raises(ValueError):
+        field.set_bytes(b"\x01")
+
+def test_shared_structs():
+    assert _value_struct("<H") is _value_struct("<H")
+    assert UInt16LE("a").size() == _value_struct("<H").size